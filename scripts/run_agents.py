@@ -142,7 +142,14 @@ async def main() -> None:
         await runtime.run_forever()
     finally:
         await http_client.close_all()
+        await email_service.close()
 
 
 if __name__ == "__main__":
+    try:  # libuv-based loop when available (ships with uvicorn[standard] on Linux/macOS)
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
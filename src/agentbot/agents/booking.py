@@ -23,6 +23,9 @@ from agentbot.services.audit_logger import AuditLogger
 class BookingProvider(Protocol):
     """Provider encapsulating booking flow interactions."""
 
+    # Empty so implementations declaring __slots__ get no per-instance __dict__
+    __slots__ = ()
+
     async def book(self, request: AppointmentBookingRequest, session: SessionRecord) -> AppointmentBookingResult:
         ...
 
@@ -50,6 +50,12 @@ class MonitorAgent(BaseAgent):
         if self._planner:
             self._planner.on_monitoring(self.config.session_id)
 
+    async def teardown(self) -> None:
+        # Providers may keep a browser page open between polls
+        aclose = getattr(self._provider, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
     async def run(self) -> None:
         await self._provider.ensure_login(self._record)
         while not self.should_stop():
@@ -77,7 +83,15 @@ class MonitorAgent(BaseAgent):
                 await self._emit_heartbeat(status=status)
             if self.should_stop():
                 break
-            await asyncio.sleep(self.config.poll_interval_seconds)
+            await asyncio.sleep(self._next_interval())
+
+    def _next_interval(self) -> float:
+        interval = float(self.config.poll_interval_seconds)
+        # Providers may adapt the cadence to how often availability changes
+        suggest = getattr(self._provider, "suggested_poll_interval", None)
+        if suggest is not None:
+            interval = suggest(self.config.session_id, interval)
+        return interval
 
     async def _emit_heartbeat(self, *, status: str) -> None:
         envelope = EventEnvelope(
@@ -15,6 +15,7 @@ from agentbot.agents.monitor import MonitorAgent
 from agentbot.browser.humanlike import set_humanlike_mouse_config
 from agentbot.core.message_bus import MessageBus
 from agentbot.core.message_bus_redis import RedisMessageBus  # optional
+from agentbot.core.availability_cache_redis import RedisAvailabilityCache
 from agentbot.core.locks_redis import RedisLockManager
 from agentbot.core.runtime import AgentRuntime
 from agentbot.core.settings import RuntimeSettings
@@ -126,9 +127,15 @@ def create_app(config_path: Path) -> FastAPI:
         logger.info("Custom Chromium flags: %s", launch_args)
     
     lock_manager = RedisLockManager() if bus_backend == "redis" else None
+    availability_cache = RedisAvailabilityCache() if bus_backend == "redis" else None
 
     def monitor_factory(config, record: SessionRecord) -> MonitorAgent:
-        provider = VfsAvailabilityProvider(browser, email_service=email_service, llm=llm)
+        provider = VfsAvailabilityProvider(
+            browser,
+            email_service=email_service,
+            llm=llm,
+            cache=availability_cache,
+        )
         return MonitorAgent(
             config,
             message_bus=message_bus,
@@ -160,6 +167,10 @@ def create_app(config_path: Path) -> FastAPI:
     async def _shutdown() -> None:  # pragma: no cover
         await runtime.stop()
         await http_client.close_all()
+        await audit_logger.close()
+        await email_service.close()
+        if availability_cache is not None:
+            await availability_cache.close()
 
     @app.get("/")
     async def root() -> dict:
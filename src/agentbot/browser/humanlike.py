@@ -159,23 +159,24 @@ def _range(
     return fallback
 
 
-async def humanlike_click(
+async def humanlike_hover(
     page: Page,
     target: LocatorLike,
     *,
     config: Mapping[str, object] | None = None,
     timeout: float = 30000,
-) -> None:
-    """Move the mouse along a curved, imperfect path and issue a click."""
+) -> Locator:
+    """Move the mouse along a curved, imperfect path onto ``target`` and pause there.
+
+    Returns the resolved locator for :func:`humanlike_press`.
+    """
     cfg = _merge_mouse_config(config)
     locator = await _resolve_locator(page, target, timeout=timeout)
     if not cfg.get("enabled", True):
-        await locator.click()
-        return
+        return locator
 
     move_duration_range = _range(cfg, "move_duration_range", fallback=(0.45, 0.9))  # type: ignore[assignment]
     hover_delay_range = _range(cfg, "hover_delay_range", fallback=(0.08, 0.2))  # type: ignore[assignment]
-    press_duration_range = _range(cfg, "press_duration_range", fallback=(0.05, 0.12))  # type: ignore[assignment]
     curvature_range = _range(cfg, "curvature_range", fallback=(0.12, 0.35))  # type: ignore[assignment]
     steps_range = _range(cfg, "steps_range", fallback=(18, 32))  # type: ignore[assignment]
     noise = float(cfg.get("noise", 2.2))
@@ -195,6 +196,33 @@ async def humanlike_click(
         steps=steps,
     )
     await asyncio.sleep(random.uniform(*hover_delay_range))  # type: ignore[arg-type]
+    return locator
+
+
+async def humanlike_press(
+    page: Page,
+    locator: Locator,
+    *,
+    config: Mapping[str, object] | None = None,
+) -> None:
+    """Press and release the mouse over ``locator`` after :func:`humanlike_hover`."""
+    cfg = _merge_mouse_config(config)
+    if not cfg.get("enabled", True):
+        await locator.click()
+        return
+    press_duration_range = _range(cfg, "press_duration_range", fallback=(0.05, 0.12))  # type: ignore[assignment]
     await page.mouse.down()
     await asyncio.sleep(random.uniform(*press_duration_range))  # type: ignore[arg-type]
     await page.mouse.up()
+
+
+async def humanlike_click(
+    page: Page,
+    target: LocatorLike,
+    *,
+    config: Mapping[str, object] | None = None,
+    timeout: float = 30000,
+) -> None:
+    """Move the mouse along a curved, imperfect path and issue a click."""
+    locator = await humanlike_hover(page, target, config=config, timeout=timeout)
+    await humanlike_press(page, locator, config=config)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import urllib.parse
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Optional, Dict, Any
 
@@ -52,12 +53,17 @@ class HybridBrowserFactory:
         self.hybrid = hybrid
         self._pw = None
         self._lock = asyncio.Lock()
+        # Separate lock: _ensure_pw runs while page() already holds self._lock.
+        self._pw_lock = asyncio.Lock()
         self._sessions: Dict[str, Dict[str, Any]] = {}  # session_id -> {browser, page, cdp_session, live_url}
+        # All BQL params are fixed after init; encode the query string once.
+        # 30 seconds timeout for session (BrowserQL basic plan limit)
+        self._bql_url = f"{self.bql_endpoint}?{urllib.parse.urlencode(self._get_bql_params(timeout=30000))}"
 
     async def _ensure_pw(self):
         """Ensure Playwright is initialized."""
         assert async_playwright is not None, "Install playwright for hybrid mode"
-        async with self._lock:
+        async with self._pw_lock:
             if self._pw is None:
                 self._pw = await async_playwright().start()
             return self._pw
@@ -91,9 +97,6 @@ class HybridBrowserFactory:
         Returns:
             browserWSEndpoint for Playwright to connect via CDP
         """
-        # 30 seconds timeout for session (BrowserQL basic plan limit)
-        params = self._get_bql_params(timeout=30000)
-        
         # Step 1: Navigate + optionally verify Cloudflare + ask BQL to hand us a CDP WebSocket endpoint
         operation_name = "ReconnectToPlaywright"
         
@@ -135,8 +138,7 @@ mutation {operation_name}($url: String!) {{
             
             try:
                 response = await client.post(
-                    self.bql_endpoint,
-                    params=params,
+                    self._bql_url,
                     headers=headers,
                     json=payload,
                 )
@@ -148,15 +150,16 @@ mutation {operation_name}($url: String!) {{
                 bql_result = response.json()
                 
                 if "errors" in bql_result:
-                    logger.warning("BQL mutation errors: %s", bql_result.get("errors"))
-                    raise Exception(f"BQL errors: {bql_result.get('errors')}")
+                    errors = bql_result["errors"]
+                    logger.warning("BQL mutation errors: %s", errors)
+                    raise Exception(f"BQL errors: {errors}")
                 
                 data = bql_result.get("data", {})
                 
                 # Log goto status
                 goto_status = data.get("goto", {}).get("status")
                 if goto_status:
-                    logger.info("BQL goto status: %s", goto_status)
+                    logger.debug("BQL goto status: %s", goto_status)
                 
                 # Log Cloudflare verification result if enabled
                 if verify_cloudflare:
@@ -175,7 +178,7 @@ mutation {operation_name}($url: String!) {{
                 expires_in = reconnect.get("expiresIn")
                 
                 if ws_endpoint:
-                    logger.info(
+                    logger.debug(
                         "Session initialized! browserWSEndpoint received (expires in %sms)",
                         expires_in
                     )
@@ -309,13 +312,22 @@ mutation {operation_name}($url: String!) {{
                     page = await context.new_page()
 
                 else:
-                    # Step 1: Initialize BQL session with stealth
+                    # Step 1: Initialize BQL session with stealth while the Playwright
+                    # driver boots; the two are independent.
                     logger.info("Creating hybrid session %s", session_id)
-                    ws_endpoint = await self._init_bql_session("about:blank", verify_cloudflare=verify_cloudflare)
+                    bql_task = asyncio.ensure_future(
+                        self._init_bql_session("about:blank", verify_cloudflare=verify_cloudflare)
+                    )
+                    pw_task = asyncio.ensure_future(self._ensure_pw())
+                    try:
+                        ws_endpoint, pw = await asyncio.gather(bql_task, pw_task)
+                    except BaseException:
+                        bql_task.cancel()
+                        pw_task.cancel()
+                        raise
                     
                     # Step 2: Connect Playwright to BQL's browser via CDP
-                    pw = await self._ensure_pw()
-                    logger.info("Connecting Playwright to BQL browser via CDP")
+                    logger.debug("Connecting Playwright to BQL browser via CDP")
                     
                     browser = await pw.chromium.connect_over_cdp(ws_endpoint)
                     
@@ -0,0 +1,34 @@
+"""Per-page cache of Playwright locators for selectors used in polling loops."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+# Keyed by the page itself. Locators hold a strong reference back to their
+# page, so a weak-keyed map would never release an entry; entries are dropped
+# explicitly when the page closes instead.
+_page_locators: Dict[Any, Dict[str, Any]] = {}
+
+
+def cached_locator(page, selector: str):
+    """``page.locator(selector)``, built once per open page and selector.
+
+    Pages without close events (BrowserQL) get a fresh locator every call.
+    """
+    cache = _page_locators.get(page)
+    if cache is None:
+        is_closed = getattr(page, "is_closed", None)
+        if not hasattr(page, "once") or is_closed is None or is_closed():
+            return page.locator(selector)
+        cache = _page_locators[page] = {}
+        page.once("close", forget_page)
+    locator = cache.get(selector)
+    if locator is None:
+        locator = cache[selector] = page.locator(selector)
+    return locator
+
+
+def forget_page(page) -> None:
+    """Drop the cached locators of ``page``; called on close, safe to repeat."""
+    _page_locators.pop(page, None)
+
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+from collections import defaultdict
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncIterator, Optional, Sequence, Callable
+from typing import AsyncIterator, Dict, Optional, Sequence, Callable
 
 from agentbot.utils.logging import get_logger
 
@@ -25,8 +27,19 @@ except Exception:  # pragma: no cover - only loaded when extra is installed
     stealth_async = None  # type: ignore
 
 
+@dataclass(slots=True)
+class _SharedContext:
+    context: BrowserContext
+    stealth_handler: Optional[Callable[[Page], None]]
+    refs: int = 0
+
+
 class BrowserFactory:
-    """Creates persistent Playwright contexts per session id (user data dir)."""
+    """Creates persistent Playwright contexts per session id (user data dir).
+
+    Chromium allows one process per user data dir, so concurrent users of the
+    same session share a single context; it is closed with its last user.
+    """
 
     DEFAULT_LAUNCH_ARGS = [
         "--disable-blink-features=AutomationControlled",
@@ -36,6 +49,10 @@ class BrowserFactory:
         "--no-sandbox",
         "--disable-setuid-sandbox",
     ]
+    # Minimal stealth shim; playwright-stealth already patches navigator.webdriver.
+    _STEALTH_INIT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    # Default for navigations that don't pass their own timeout.
+    NAVIGATION_TIMEOUT_MS = 8000
 
     def __init__(
         self,
@@ -54,6 +71,8 @@ class BrowserFactory:
         self._pw = None
         self._launch_args = list(self.DEFAULT_LAUNCH_ARGS)
         self._stealth_warning_logged = False
+        self._contexts: Dict[str, _SharedContext] = {}
+        self._context_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         if extra_launch_args:
             for arg in extra_launch_args:
                 if arg not in self._launch_args:
@@ -122,8 +141,7 @@ class BrowserFactory:
         logger.info("playwright-stealth enabled for persistent context")
         return _handler
 
-    @asynccontextmanager
-    async def context(self, session_id: str) -> AsyncIterator[BrowserContext]:
+    async def _launch_context(self, session_id: str) -> _SharedContext:
         pw = await self._ensure_pw()
         user_dir = self.user_data_root / session_id
         user_dir.mkdir(parents=True, exist_ok=True)
@@ -148,21 +166,48 @@ class BrowserFactory:
             has_touch=False,
             is_mobile=False,
         )
+        context.set_default_navigation_timeout(self.NAVIGATION_TIMEOUT_MS)
         stealth_handler = await self._enable_context_stealth(context)
+        if stealth_handler is None:
+            # minimal stealth: remove webdriver flag (skipped when playwright-stealth runs)
+            await context.add_init_script(self._STEALTH_INIT)
+        shared = _SharedContext(context, stealth_handler)
+        # Forget contexts that die underneath us (browser crash, manual close)
+        context.on("close", lambda _: self._forget_context(session_id, shared))
+        return shared
+
+    def _forget_context(self, session_id: str, shared: _SharedContext) -> None:
+        if self._contexts.get(session_id) is shared:
+            del self._contexts[session_id]
+
+    @asynccontextmanager
+    async def context(self, session_id: str) -> AsyncIterator[BrowserContext]:
+        async with self._context_locks[session_id]:
+            shared = self._contexts.get(session_id)
+            if shared is None:
+                shared = self._contexts[session_id] = await self._launch_context(session_id)
+            shared.refs += 1
         try:
-            # minimal stealth: remove webdriver flag
-            await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            yield context
+            yield shared.context
         finally:
-            if stealth_handler:
-                try:
-                    context.off("page", stealth_handler)
-                except Exception:
-                    pass
-            await context.close()
+            async with self._context_locks[session_id]:
+                shared.refs -= 1
+                if shared.refs == 0:
+                    self._forget_context(session_id, shared)
+                    if shared.stealth_handler:
+                        try:
+                            shared.context.off("page", shared.stealth_handler)
+                        except Exception:
+                            pass
+                    await shared.context.close()
 
     @asynccontextmanager
     async def page(self, session_id: str) -> AsyncIterator[Page]:
         async with self.context(session_id) as ctx:
             page = await ctx.new_page()
-            yield page
+            try:
+                yield page
+            finally:
+                # The context may outlive this page when it is shared
+                if not page.is_closed():
+                    await page.close()
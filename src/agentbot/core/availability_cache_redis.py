@@ -0,0 +1,100 @@
+"""Redis-backed cache of availability probe results shared across sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import orjson
+from redis.asyncio import Redis
+
+from .locks_redis import RELEASE_SCRIPT
+from .models import AppointmentAvailability
+
+
+class RedisAvailabilityCache:
+    """Share one probe result per (centre, category, sub-category) between sessions.
+
+    Entries are fresh for ``ttl`` seconds and kept ``stale_window`` seconds
+    longer as a fallback for when a real probe fails. On a miss one session
+    claims the probe (for at most ``probe_ttl`` seconds) and the others wait
+    for its result instead of probing the same centre in parallel.
+    """
+
+    PROBE_POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        *,
+        ttl: float = 5.0,
+        stale_window: float = 60.0,
+        prefix: str = "availability",
+        probe_ttl: float = 30.0,
+    ) -> None:
+        self._redis = Redis.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self.ttl = ttl
+        self.stale_window = stale_window
+        self._prefix = prefix
+        self.probe_ttl = probe_ttl
+
+    def key(self, centre: Optional[str], category: Optional[str], sub_category: Optional[str]) -> str:
+        digest = hashlib.blake2b(f"{centre}|{category}|{sub_category}".encode(), digest_size=16)
+        return f"{self._prefix}:{digest.hexdigest()}"
+
+    async def get(
+        self, key: str, session_id: str
+    ) -> Optional[Tuple[bool, List[AppointmentAvailability]]]:
+        """Return ``(fresh, slots)`` rebound to ``session_id``, or None on a miss."""
+        entry = await self._redis.hgetall(key)
+        if not entry:
+            return None
+        fresh = float(entry[b"generated_at"]) + self.ttl > time.time()
+        slots = [
+            AppointmentAvailability.model_validate({**item, "session_id": session_id})
+            for item in orjson.loads(entry[b"body"])
+        ]
+        return fresh, slots
+
+    async def set(self, key: str, slots: List[AppointmentAvailability]) -> None:
+        now = time.time()
+        body = orjson.dumps([slot.model_dump(mode="json") for slot in slots])
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(key, mapping={"generated_at": now, "stale_at": now + self.ttl, "body": body})
+        pipe.expire(key, int(self.ttl + self.stale_window) + 1)
+        await pipe.execute()
+
+    async def claim_probe(self, key: str) -> Optional[str]:
+        """Claim the probe of ``key``; return a token for :meth:`release_probe`, or None if taken."""
+        token = uuid.uuid4().hex
+        if await self._redis.set(f"{key}:probe", token, px=int(self.probe_ttl * 1000), nx=True):
+            return token
+        return None
+
+    async def release_probe(self, key: str, token: str) -> None:
+        await self._redis.eval(RELEASE_SCRIPT, 1, f"{key}:probe", token)
+
+    async def wait_for_probe(
+        self, key: str, session_id: str
+    ) -> Optional[List[AppointmentAvailability]]:
+        """Wait for the session probing ``key`` to store its result.
+
+        Returns the fresh slots, or None once the probe is released (or its
+        claim expires) without a fresh entry.
+        """
+        while True:
+            await asyncio.sleep(self.PROBE_POLL_INTERVAL)
+            # Checked before the entry: a release always follows the write
+            probing = await self._redis.exists(f"{key}:probe")
+            cached = await self.get(key, session_id)
+            if cached is not None and cached[0]:
+                return cached[1]
+            if not probing:
+                return None
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -11,8 +11,19 @@ from redis.asyncio import Redis
 
 from .locks import AsyncLock, LockManager
 
+# Delete KEYS[1] only if it still holds our token (ARGV[1])
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+"""
+
 
 class _RedisLock:
+    __slots__ = ("_redis", "_key", "_ttl_ms", "_token", "_acquired")
+
     def __init__(self, redis: Redis, key: str, ttl_ms: int) -> None:
         self._redis = redis
         self._key = f"lock:{key}"
@@ -29,16 +40,8 @@ class _RedisLock:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         if not self._acquired:
             return
-        # release only if token matches
-        lua = """
-        if redis.call('get', KEYS[1]) == ARGV[1] then
-            return redis.call('del', KEYS[1])
-        else
-            return 0
-        end
-        """
         try:
-            await self._redis.eval(lua, 1, self._key, self._token)
+            await self._redis.eval(RELEASE_SCRIPT, 1, self._key, self._token)
         finally:
             self._acquired = False
 
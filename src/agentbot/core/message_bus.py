@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional, Set, Tuple
 
 from .models import EventEnvelope, EventType
 
@@ -15,15 +15,31 @@ Subscriber = Callable[[EventEnvelope], Awaitable[None]]
 
 @dataclass(slots=True, eq=False)
 class _Subscription:
-    queue: "asyncio.Queue[EventEnvelope]"
-    session_filter: Optional[str]
+    # A bounded deque drops the oldest event by itself when full, which is the
+    # backpressure policy we want; `wake` signals the consumer.
+    buf: "deque[EventEnvelope]"
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def push(self, envelope: EventEnvelope) -> None:
+        self.buf.append(envelope)
+        self.wake.set()
 
 
 class MessageBus:
     """Pub/sub bus with optional session filtering."""
 
     def __init__(self) -> None:
-        self._topics: Dict[EventType, Set[_Subscription]] = defaultdict(set)
+        # event type -> session id (None = all sessions) -> subscriptions, so
+        # publish only visits subscribers that can match the envelope.
+        self._topics: Dict[EventType, Dict[Optional[str], Set[_Subscription]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        # Side index so unsubscribe touches only its own bucket and can skip
+        # subscriptions already dropped by close().
+        self._sub_index: Dict[int, Tuple[EventType, Optional[str]]] = {}
+        # Immutable copy of _topics read by publish without locking; only
+        # subscribe/unsubscribe (the rare path) rebuild it, under _lock.
+        self._snapshot: Mapping[EventType, Mapping[Optional[str], Tuple[_Subscription, ...]]] = {}
         self._lock = asyncio.Lock()
         self._closed = False
 
@@ -32,21 +48,13 @@ class MessageBus:
         if self._closed:
             raise RuntimeError("MessageBus is closed")
 
-        async with self._lock:
-            subscriptions = list(self._topics.get(envelope.type, set()))
+        buckets = self._snapshot.get(envelope.type)
+        if not buckets:
+            return
+        subscriptions = buckets.get(envelope.session_id, ()) + buckets.get(None, ())
 
         for subscription in subscriptions:
-            if subscription.session_filter and subscription.session_filter != envelope.session_id:
-                continue
-            try:
-                subscription.queue.put_nowait(envelope)
-            except asyncio.QueueFull:
-                # Backpressure: drop oldest to ensure newest availability event goes through.
-                try:
-                    subscription.queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-                subscription.queue.put_nowait(envelope)
+            subscription.push(envelope)
 
     async def subscribe(
         self,
@@ -59,18 +67,41 @@ class MessageBus:
         if self._closed:
             raise RuntimeError("MessageBus is closed")
 
-        queue: "asyncio.Queue[EventEnvelope]" = asyncio.Queue(max_queue)
-        subscription = _Subscription(queue=queue, session_filter=session_id)
+        subscription = _Subscription(buf=deque(maxlen=max_queue if max_queue > 0 else None))
+        key = (event_type, session_id or None)
         async with self._lock:
-            self._topics[event_type].add(subscription)
+            self._topics[event_type][key[1]].add(subscription)
+            self._sub_index[id(subscription)] = key
+            self._refresh_snapshot(event_type)
 
         try:
+            buf, wake = subscription.buf, subscription.wake
             while True:
-                envelope = await queue.get()
-                yield envelope
+                await wake.wait()
+                wake.clear()
+                while buf:
+                    yield buf.popleft()
         finally:
             async with self._lock:
-                self._topics[event_type].discard(subscription)
+                key = self._sub_index.pop(id(subscription), None)
+                if key is not None:
+                    buckets = self._topics[key[0]]
+                    bucket = buckets[key[1]]
+                    bucket.discard(subscription)
+                    if not bucket:
+                        del buckets[key[1]]
+                    self._refresh_snapshot(key[0])
+
+    def _refresh_snapshot(self, event_type: EventType) -> None:
+        # Must be called with _lock held; swaps in a new mapping so readers
+        # never observe a partially updated one.
+        snapshot = dict(self._snapshot)
+        buckets = self._topics.get(event_type)
+        if buckets:
+            snapshot[event_type] = {key: tuple(subs) for key, subs in buckets.items()}
+        else:
+            snapshot.pop(event_type, None)
+        self._snapshot = snapshot
 
     async def close(self) -> None:
         """Stop accepting new events and unblock subscribers."""
@@ -78,18 +109,14 @@ class MessageBus:
         async with self._lock:
             topics = list(self._topics.items())
             self._topics.clear()
-        for event_type, subscriptions in topics:
+            self._sub_index.clear()
+            self._snapshot = {}
+        for event_type, buckets in topics:
             sentinel = EventEnvelope(
                 type=event_type,
                 session_id="*",
                 payload={"message": "MessageBus closed", "__bus_closed__": True},
             )
-            for subscription in subscriptions:
-                try:
-                    subscription.queue.put_nowait(sentinel)
-                except asyncio.QueueFull:
-                    try:
-                        subscription.queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        pass
-                    subscription.queue.put_nowait(sentinel)
+            for bucket in buckets.values():
+                for subscription in bucket:
+                    subscription.push(sentinel)
@@ -3,60 +3,210 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from redis.asyncio import Redis
 
+try:  # binary wire format for stream entries
+    import msgpack
+except Exception:  # pragma: no cover - declared as a dependency
+    msgpack = None  # type: ignore
+
+from agentbot.utils.logging import get_logger
+
+from .message_bus import MessageBus
 from .models import EventEnvelope, EventType
 
 
+logger = get_logger("RedisMessageBus")
+
+
 class RedisMessageBus:
-    def __init__(self, url: str, *, stream: str = "agentbot.events") -> None:
-        self._redis = Redis.from_url(url, decode_responses=True)
+    # Publishes are buffered and flushed as pipelined XADDs: up to BATCH
+    # envelopes per round-trip, waiting at most BATCH_DELAY for a batch to fill.
+    BATCH = 256
+    BATCH_DELAY = 0.005
+    # Backoff between attempts to write a batch while Redis is unreachable.
+    RETRY_INITIAL = 0.1
+    RETRY_MAX = 5.0
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        stream: str = "agentbot.events",
+        max_pending: int = 10_000,
+        maxlen: Optional[int] = 100_000,
+    ) -> None:
+        if msgpack is None:
+            raise RuntimeError("RedisMessageBus requires msgpack (pip install msgpack)")
+        # Entries are msgpack blobs, so skip redis-py's implicit UTF-8 decoding.
+        self._redis = Redis.from_url(url, decode_responses=False)
         self._stream = stream
+        # One stream per event type, so consumers never fetch events of other types.
+        self._type_streams = {event_type: f"{stream}:{event_type.value}" for event_type in EventType}
+        # Approximate (MAXLEN ~) trimming keeps the stream bounded when
+        # consumers lag, at near-zero cost; None disables trimming.
+        self._maxlen = maxlen
         self._closed = False
+        self._queue: "asyncio.Queue[EventEnvelope]" = asyncio.Queue(max_pending)
+        self._flusher: Optional[asyncio.Task[None]] = None
+        self._local = MessageBus()
+        self._readers: Dict[EventType, asyncio.Task[None]] = {}
+        self._subscribers: Dict[EventType, int] = {}
 
     async def publish(self, envelope: EventEnvelope) -> None:
         if self._closed:
             raise RuntimeError("RedisMessageBus is closed")
-        payload = json.dumps(envelope.model_dump(mode="json"))
-        await self._redis.xadd(self._stream, {"event": payload})
+        if self._flusher is None or self._flusher.done():
+            # Started lazily: the bus is usually constructed outside a running loop.
+            self._flusher = asyncio.create_task(self._flush_loop(), name="redis-bus-flusher")
+        # Encoded here, not in the flusher, so a payload msgpack rejects raises
+        # to its publisher instead of failing a whole batch later.
+        envelope.wire()
+        await self._queue.put(envelope)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            self._drain_into(batch)
+            if len(batch) < self.BATCH:
+                await asyncio.sleep(self.BATCH_DELAY)
+                self._drain_into(batch)
+            try:
+                await self._write_with_retry(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_with_retry(self, batch: List[EventEnvelope]) -> None:
+        # Transport failures keep the batch and retry it; publishers meanwhile
+        # fill the bounded queue and block, rather than events being dropped.
+        # Once closing, one failed attempt gives up so close() can't hang.
+        delay = self.RETRY_INITIAL
+        while True:
+            try:
+                await self._write_batch(batch)
+                return
+            except Exception:
+                if self._closed:
+                    logger.exception("Dropping %d events for %s:* on close", len(batch), self._stream)
+                    return
+                logger.exception("Failed to publish %d events to %s:*; retrying", len(batch), self._stream)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RETRY_MAX)
+
+    def _drain_into(self, batch: List[EventEnvelope]) -> None:
+        while len(batch) < self.BATCH:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _write_batch(self, batch: List[EventEnvelope]) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        for envelope in batch:
+            pipe.xadd(
+                self._type_streams[envelope.type],
+                {b"event": envelope.wire()},
+                maxlen=self._maxlen,
+                approximate=True,
+            )
+        # A command Redis rejects would be rejected again, so only that entry
+        # is dropped; a transport error raises and the batch is retried.
+        results = await pipe.execute(raise_on_error=False)
+        for envelope, result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error("Redis rejected %s event for %s: %s", envelope.type.value, envelope.session_id, result)
 
     async def subscribe(
         self, event_type: EventType, *, session_id: Optional[str] = None, max_queue: int = 10
     ) -> AsyncIterator[EventEnvelope]:
+        # Redis sees one reader per event type; in-process subscribers are fed
+        # from it through a local MessageBus.
+        self._subscribers[event_type] = self._subscribers.get(event_type, 0) + 1
+        reader = self._readers.get(event_type)
+        if reader is None or reader.done():
+            self._readers[event_type] = asyncio.create_task(
+                self._read_loop(event_type), name=f"redis-bus-reader:{event_type.value}"
+            )
+        try:
+            async for envelope in self._local.subscribe(
+                event_type, session_id=session_id, max_queue=max_queue
+            ):
+                yield envelope
+        finally:
+            self._subscribers[event_type] -= 1
+            if not self._subscribers[event_type]:
+                del self._subscribers[event_type]
+                reader = self._readers.pop(event_type, None)
+                if reader is not None:
+                    reader.cancel()
+
+    async def _read_loop(self, event_type: EventType) -> None:
         group = f"g:{event_type}"
-        consumer = f"c:{session_id or '*'}:{id(self)}"
+        consumer = f"c:{id(self)}"
+        stream = self._type_streams[event_type]
+        streams_arg = {stream: ">"}
+        xreadgroup = self._redis.xreadgroup
+        xack = self._redis.xack
+        from_dict = EventEnvelope.from_dict
+        unpackb = msgpack.unpackb
+        publish = self._local.publish
         try:
-            await self._redis.xgroup_create(self._stream, group, id="$", mkstream=True)
+            await self._redis.xgroup_create(stream, group, id="$", mkstream=True)
         except Exception:
             pass
 
         while not self._closed:
-            res = await self._redis.xreadgroup(group, consumer, {self._stream: ">"}, count=10, block=5000)
+            try:
+                res = await xreadgroup(group, consumer, streams_arg, count=100, block=5000)
+            except Exception:
+                logger.exception("Failed to read from %s", stream)
+                await asyncio.sleep(1)
+                continue
             if not res:
                 continue
             _, entries = res[0]
-            for entry_id, fields in entries:
-                try:
-                    raw = fields.get("event")
-                    if not raw:
-                        await self._redis.xack(self._stream, group, entry_id)
-                        continue
-                    envelope = EventEnvelope.model_validate_json(raw)
-                    if envelope.type != event_type:
-                        await self._redis.xack(self._stream, group, entry_id)
-                        continue
-                    if session_id and envelope.session_id != session_id:
-                        await self._redis.xack(self._stream, group, entry_id)
-                        continue
-                    yield envelope
-                finally:
-                    await self._redis.xack(self._stream, group, entry_id)
+            # Ack everything handed out in this batch with a single variadic XACK.
+            ack_ids: List[bytes] = []
+            try:
+                for entry_id, fields in entries:
+                    ack_ids.append(entry_id)
+                    # One bad entry must not end the reader every subscriber shares;
+                    # it is logged and acked so it isn't redelivered forever.
+                    try:
+                        raw = fields.get(b"event")
+                        if raw:
+                            envelope = from_dict(unpackb(raw, raw=False))
+                            if envelope.id is None:
+                                envelope.id = entry_id.decode()
+                            await publish(envelope)
+                    except Exception:
+                        logger.exception("Skipping unreadable entry %r on %s", entry_id, stream)
+            finally:
+                if ack_ids:
+                    try:
+                        await xack(stream, group, *ack_ids)
+                    except Exception:
+                        logger.exception("Failed to ack %d entries on %s", len(ack_ids), stream)
 
     async def close(self) -> None:
         self._closed = True
+        if self._flusher is not None:
+            if not self._flusher.done():
+                # Flush whatever is still buffered before tearing down the connection.
+                await self._queue.join()
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        readers = list(self._readers.values())
+        self._readers.clear()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        await self._local.close()
         await self._redis.aclose()
-
-
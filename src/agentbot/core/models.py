@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import datetime as dt
-import uuid
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, Optional
 
@@ -60,13 +60,52 @@ class AppointmentBookingResult(BaseModel):
     raw_response: Optional[Dict[str, Any]] = None
 
 
-class EventEnvelope(BaseModel):
-    """Wrapper to transport events safely through the message bus."""
+@dataclass(slots=True, kw_only=True)
+class EventEnvelope:
+    """Wrapper to transport events safely through the message bus.
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: dt.datetime = Field(default_factory=lambda: dt.datetime.now(dt.timezone.utc))
+    A plain dataclass rather than a pydantic model: envelopes are built and
+    decoded on every publish, and the payload is validated by its consumer.
+    """
+
+    # Not minted per envelope; Redis-delivered envelopes take their stream entry id.
+    id: Optional[str] = None
+    created_at: dt.datetime = field(default_factory=lambda: dt.datetime.now(dt.timezone.utc))
     type: EventType
     session_id: str
     payload: Dict[str, Any]
     trace_id: Optional[str] = None
-
+    # Encoded form cached by wire(); envelopes are not mutated once published.
+    _wire: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON/msgpack-friendly dict of primitives."""
+
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "type": self.type.value,
+            "session_id": self.session_id,
+            "payload": self.payload,
+            "trace_id": self.trace_id,
+        }
+
+    def wire(self) -> bytes:
+        """Return the msgpack encoding used on the Redis stream, encoding at most once."""
+
+        if self._wire is None:
+            import msgpack  # deferred: only the Redis transport needs it
+
+            self._wire = msgpack.packb(self.to_dict(), use_bin_type=True)
+        return self._wire
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventEnvelope":
+        return cls(
+            id=data.get("id"),
+            created_at=dt.datetime.fromisoformat(data["created_at"]),
+            type=EventType(data["type"]),
+            session_id=data["session_id"],
+            payload=data["payload"],
+            trace_id=data.get("trace_id"),
+        )
@@ -18,7 +18,7 @@ class SessionState(enum.Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionFSM:
     state: SessionState = SessionState.IDLE
     last_slot: Optional[AppointmentAvailability] = None
@@ -31,31 +31,34 @@ class AgentPlanner:
     def __init__(self) -> None:
         self._sessions: Dict[str, SessionFSM] = {}
 
+    def _transition(self, session_id: str, state: SessionState) -> SessionFSM:
+        # Only allocate for sessions we have not seen yet (setdefault always would).
+        fsm = self._sessions.get(session_id)
+        if fsm is None:
+            fsm = self._sessions[session_id] = SessionFSM()
+        fsm.state = state
+        return fsm
+
     def on_monitoring(self, session_id: str) -> None:
-        fsm = self._sessions.setdefault(session_id, SessionFSM())
-        fsm.state = SessionState.MONITORING
+        self._transition(session_id, SessionState.MONITORING)
 
     def on_availability(self, session_id: str, slot: AppointmentAvailability) -> None:
-        fsm = self._sessions.setdefault(session_id, SessionFSM())
-        fsm.state = SessionState.CLAIMING
+        fsm = self._transition(session_id, SessionState.CLAIMING)
         fsm.last_slot = slot
 
     def on_booking_result(self, session_id: str, result: AppointmentBookingResult) -> SessionState:
-        fsm = self._sessions.setdefault(session_id, SessionFSM())
+        state = SessionState.BOOKED if result.success else SessionState.FAILED
+        fsm = self._transition(session_id, state)
         fsm.last_result = result
-        if result.success:
-            fsm.state = SessionState.BOOKED
-        else:
-            fsm.state = SessionState.FAILED
-        return fsm.state
+        return state
 
     def on_booking_attempt(self, session_id: str) -> None:
-        fsm = self._sessions.setdefault(session_id, SessionFSM())
-        fsm.state = SessionState.BOOKING
+        self._transition(session_id, SessionState.BOOKING)
 
     def reset(self, session_id: str) -> None:
         if session_id in self._sessions:
             self._sessions[session_id] = SessionFSM(state=SessionState.IDLE)
 
     def get_state(self, session_id: str) -> SessionState:
-        return self._sessions.get(session_id, SessionFSM()).state
+        fsm = self._sessions.get(session_id)
+        return fsm.state if fsm is not None else SessionState.IDLE
@@ -73,9 +73,36 @@ class AgentRuntime:
             if self._started:
                 return
             self.logger.info("Starting %d agent bundles", len(self._bundles))
-            for bundle in self._bundles:
-                await bundle.monitor_agent.start()
-                await bundle.booking_agent.start()
+            agents = [
+                (bundle.session_id, agent)
+                for bundle in self._bundles
+                for agent in (bundle.monitor_agent, bundle.booking_agent)
+            ]
+            results = await asyncio.gather(
+                *(agent.start() for _, agent in agents),
+                return_exceptions=True,
+            )
+            failures = []
+            for (session_id, agent), result in zip(agents, results):
+                if isinstance(result, BaseException):
+                    self.logger.error(
+                        "Failed to start %s for session %s",
+                        type(agent).__name__,
+                        session_id,
+                        exc_info=result,
+                    )
+                    failures.append(result)
+            if failures:
+                # Don't leave the rest running behind a runtime that never started
+                await asyncio.gather(
+                    *(
+                        agent.stop()
+                        for (_, agent), result in zip(agents, results)
+                        if not isinstance(result, BaseException)
+                    ),
+                    return_exceptions=True,
+                )
+                raise failures[0]
             self._started = True
 
     async def stop(self) -> None:
@@ -105,3 +132,5 @@ class AgentRuntime:
         finally:
             await self.stop()
             await self.message_bus.close()
+            if self.audit_logger:
+                await self.audit_logger.close()
@@ -6,10 +6,15 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 import yaml
-from pydantic import BaseModel, Field, HttpUrl, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, ValidationError
+
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class EmailSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     host: str
     port: int = 993
     username: str
@@ -20,6 +25,9 @@ class EmailSettings(BaseModel):
 
 class BrowserQLSettings(BaseModel):
     """BrowserQL/Browserless.io settings."""
+
+    model_config = ConfigDict(frozen=True)
+
     endpoint: Optional[HttpUrl] = None
     token: Optional[str] = None  # Browserless.io token (can also use BROWSERQL_TOKEN env var)
     proxy: Optional[str] = None  # "residential" or "datacenter"
@@ -32,6 +40,8 @@ class BrowserQLSettings(BaseModel):
 class HumanlikeMouseSettings(BaseModel):
     """Configures imperfect cursor motion for Playwright interactions."""
 
+    model_config = ConfigDict(frozen=True)
+
     enabled: bool = True
     move_duration_range: Tuple[float, float] = (0.45, 0.9)
     hover_delay_range: Tuple[float, float] = (0.08, 0.2)
@@ -42,6 +52,8 @@ class HumanlikeMouseSettings(BaseModel):
 
 
 class RuntimeSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     base_url: HttpUrl
     availability_endpoint: str
     booking_endpoint: str
@@ -55,13 +67,15 @@ class RuntimeSettings(BaseModel):
 
     @classmethod
     def from_file(cls, path: Path) -> "RuntimeSettings":
-        data = yaml.safe_load(path.read_text())
+        data = yaml.load(path.read_text(), Loader=_YamlLoader)
         try:
             settings = cls.model_validate(data)
         except ValidationError as exc:
             raise ValueError(f"Invalid runtime settings: {exc}") from exc
+        # Settings are frozen, so relative paths are resolved into a copy.
+        resolved = {}
         if not settings.session_store_path.is_absolute():
-            settings.session_store_path = (path.parent / settings.session_store_path).resolve()
+            resolved["session_store_path"] = (path.parent / settings.session_store_path).resolve()
         if settings.form_mapping_path and not settings.form_mapping_path.is_absolute():
-            settings.form_mapping_path = (path.parent / settings.form_mapping_path).resolve()
-        return settings
+            resolved["form_mapping_path"] = (path.parent / settings.form_mapping_path).resolve()
+        return settings.model_copy(update=resolved) if resolved else settings
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
-import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, ValidationError
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 from agentbot.core.models import AgentConfig
 
@@ -26,23 +26,38 @@ class SessionRecord(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: dt.datetime = Field(default_factory=lambda: dt.datetime.now(dt.timezone.utc))
 
+    # Built once per record; records are replaced, not edited, on upsert.
+    _agent_config: Optional[Tuple[int, AgentConfig]] = PrivateAttr(default=None)
+
     def to_agent_config(self, default_poll: int = 30) -> AgentConfig:
+        cached = self._agent_config
+        if cached is not None and cached[0] == default_poll:
+            return cached[1]
         poll = int(self.preferences.get("poll_interval_seconds", default_poll))
-        return AgentConfig(
+        config = AgentConfig(
             session_id=self.session_id,
             user_id=self.user_id,
             poll_interval_seconds=poll,
             metadata=self.metadata | {"email": self.email},
         )
+        self._agent_config = (default_poll, config)
+        return config
 
 
 class SessionStore:
     """Minimal JSON file session persistence with async-friendly API."""
 
+    # Mutations within this window share one file rewrite.
+    FLUSH_DELAY = 0.05
+
     def __init__(self, path: Path, *, encryption_key: Optional[str] = None) -> None:
         self._path = path
         self._lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._pending_flush: Optional[asyncio.Future[None]] = None
         self._records: Dict[str, SessionRecord] = {}
+        # JSON form of each record as last written; dropped when the record changes.
+        self._serialized: Dict[str, Dict[str, Any]] = {}
         self._fernet = self._init_fernet(encryption_key)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         if path.exists():
@@ -72,7 +87,7 @@ class SessionStore:
                 raw = self._fernet.decrypt(raw)
             except InvalidToken as exc:
                 raise ValueError("Unable to decrypt session store with provided key") from exc
-        data = json.loads(raw.decode("utf-8"))
+        data = orjson.loads(raw)
         records = {}
         for item in data:
             try:
@@ -82,12 +97,36 @@ class SessionStore:
             records[record.session_id] = record
         self._records = records
 
-    def _dump(self) -> None:
-        serialized = [record.model_dump(mode="json") for record in self._records.values()]
-        payload = json.dumps(serialized, indent=2).encode("utf-8")
+    def _dump(self, serialized: List[Dict[str, Any]]) -> None:
+        payload = orjson.dumps(serialized, option=orjson.OPT_INDENT_2)
         if self._fernet:
             payload = self._fernet.encrypt(payload)
-        self._path.write_bytes(payload)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self._path)
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.FLUSH_DELAY)
+        async with self._write_lock:
+            async with self._lock:
+                # Mutations from here on schedule the next flush.
+                self._pending_flush = None
+                cache = self._serialized
+                serialized = []
+                for session_id, record in self._records.items():
+                    item = cache.get(session_id)
+                    if item is None:
+                        item = cache[session_id] = record.model_dump(mode="json")
+                    serialized.append(item)
+            await asyncio.to_thread(self._dump, serialized)
+
+    async def _commit(self) -> None:
+        """Wait until the current in-memory state has been written to disk."""
+
+        if self._pending_flush is None:
+            self._pending_flush = asyncio.ensure_future(self._flush())
+        # Shielded so one cancelled caller does not abort the write for the others.
+        await asyncio.shield(self._pending_flush)
 
     async def list_sessions(self) -> List[SessionRecord]:
         async with self._lock:
@@ -100,13 +139,15 @@ class SessionStore:
     async def upsert(self, record: SessionRecord) -> None:
         async with self._lock:
             self._records[record.session_id] = record
-            self._dump()
+            self._serialized.pop(record.session_id, None)
+        await self._commit()
 
     async def delete(self, session_id: str) -> None:
         async with self._lock:
-            if session_id in self._records:
-                del self._records[session_id]
-                self._dump()
+            if self._records.pop(session_id, None) is None:
+                return
+            self._serialized.pop(session_id, None)
+        await self._commit()
 
     async def iter_agent_configs(self, *, default_poll: int = 30) -> Iterable[AgentConfig]:
         sessions = await self.list_sessions()
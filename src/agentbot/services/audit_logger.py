@@ -4,20 +4,30 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
-import json
+import io
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
+
 
 class AuditLogger:
     """Persist structured audit trail entries for observability and compliance."""
 
+    # Buffered lines reach the file at most this long after being logged.
+    FLUSH_INTERVAL = 0.05
+    BUFFER_SIZE = 64 * 1024
+
     def __init__(self, path: Optional[Path] = None) -> None:
         target = path or Path(os.getenv("AGENTBOT_AUDIT_LOG", "artifacts/audit.log"))
         target.parent.mkdir(parents=True, exist_ok=True)
         self._path = target
-        self._lock = asyncio.Lock()
+        # One O_APPEND descriptor for the logger's lifetime; BufferedWriter has
+        # its own internal lock, so concurrent writes and flushes are safe.
+        fd = os.open(str(target), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._buf = io.BufferedWriter(io.FileIO(fd, "a"), buffer_size=self.BUFFER_SIZE)
+        self._flusher: Optional[asyncio.Task[None]] = None
 
     async def log(self, *, event: str, session_id: str, payload: Dict[str, Any]) -> None:
         record = {
@@ -26,11 +36,24 @@ class AuditLogger:
             "session_id": session_id,
             "payload": payload,
         }
-        async with self._lock:
-            await asyncio.to_thread(self._append_line, record)
-
-    def _append_line(self, record: Dict[str, Any]) -> None:
-        with self._path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=True))
-            fh.write("\n")
-
+        # Appending to the in-memory buffer is cheap; disk I/O happens in the flusher.
+        self._buf.write(orjson.dumps(record) + b"\n")
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_soon(), name="audit-log-flush")
+
+    async def _flush_soon(self) -> None:
+        await asyncio.sleep(self.FLUSH_INTERVAL)
+        await asyncio.to_thread(self._buf.flush)
+
+    async def close(self) -> None:
+        """Flush buffered entries and release the file descriptor."""
+        if self._buf.closed:
+            return
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await asyncio.to_thread(self._buf.close)
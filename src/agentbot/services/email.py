@@ -3,17 +3,33 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import imaplib
 import re
+import threading
+import time
 from contextlib import contextmanager
 from email.message import Message
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 
 
 class EmailInboxService:
     """IMAP email reader to extract verification codes with simple filtering."""
 
     CODE_REGEX = re.compile(r"\b(\d{4,8})\b")
+    # Same pattern over raw message bytes: it is pure ASCII, so bodies need no decode
+    CODE_REGEX_BYTES = re.compile(rb"\b(\d{4,8})\b")
+    # Blocking IMAP calls get their own bounded pool (one thread per inbox
+    # polled concurrently) so slow polls never starve the default executor.
+    _IMAP_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="imap")
+    # Re-check interval while waiting for a code to arrive; the connection is
+    # kept open, so each check is a SEARCH round-trip only. Checks start at
+    # MIN_POLL_INTERVAL and back off to POLL_INTERVAL, since codes are usually
+    # requested right before the wait starts. Polling rather than IDLE: the
+    # service sits on stdlib imaplib so it runs without the optional ``email``
+    # extra (imapclient, which does support IDLE).
+    MIN_POLL_INTERVAL = 0.5
+    POLL_INTERVAL = 2.0
 
     def __init__(
         self,
@@ -31,19 +47,68 @@ class EmailInboxService:
         self.password = password
         self.folder = folder
         self.use_ssl = use_ssl
+        # One logged-in connection reused across polls (TLS + LOGIN is the
+        # expensive part); imaplib is not thread-safe, hence the lock.
+        self._cached_client: Optional[imaplib.IMAP4] = None
+        self._client_lock = threading.Lock()
 
-    @contextmanager
-    def _client(self) -> imaplib.IMAP4:
+    def _connect(self) -> imaplib.IMAP4:
         client = imaplib.IMAP4_SSL(self.host, self.port) if self.use_ssl else imaplib.IMAP4(self.host, self.port)
-        try:
-            client.login(self.username, self.password)
-            yield client
-        finally:
+        client.login(self.username, self.password)
+        return client
+
+    def _drop_client(self) -> None:
+        client, self._cached_client = self._cached_client, None
+        if client is not None:
             try:
                 client.logout()
             except Exception:
                 pass
 
+    @contextmanager
+    def _client(self) -> Iterator[imaplib.IMAP4]:
+        with self._client_lock:
+            client = self._cached_client
+            if client is not None:
+                try:
+                    client.noop()
+                except Exception:
+                    self._drop_client()
+                    client = None
+            if client is None:
+                client = self._cached_client = self._connect()
+            try:
+                yield client
+            except Exception:
+                # Connection state is unknown after a failed command; reconnect next time
+                self._drop_client()
+                raise
+
+    async def close(self) -> None:
+        """Log out of the cached IMAP connection, if any."""
+        def _close() -> None:
+            with self._client_lock:
+                self._drop_client()
+
+        await asyncio.get_running_loop().run_in_executor(self._IMAP_POOL, _close)
+
+    async def mailbox_mark(self) -> int:
+        """Return the folder's current highest message number.
+
+        Pass it as ``after`` to :meth:`fetch_latest_code` to accept only mail
+        that arrives later. Taken right before the action that sends the code,
+        so messages expunged in between are the only way it can drift.
+        """
+
+        def _mark() -> int:
+            with self._client() as client:
+                status, data = client.select(self.folder)
+                if status != "OK":
+                    raise RuntimeError("Unable to select email folder")
+                return int(data[0])
+
+        return await asyncio.get_running_loop().run_in_executor(self._IMAP_POOL, _mark)
+
     async def fetch_latest_code(
         self,
         *,
@@ -51,50 +116,142 @@ class EmailInboxService:
         subject_filters: Optional[list[str]] = None,
         unseen_only: bool = True,
         lookback: int = 50,
+        after: Optional[int] = None,
     ) -> Optional[str]:
-        """Fetch the latest numeric code in the mailbox.
+        """Wait up to ``timeout`` seconds for a numeric code to arrive in the mailbox.
+
+        Returns as soon as a matching message is found, or None at the deadline.
 
         Parameters
         - subject_filters: list of substrings to match in the Subject (any matches)
         - unseen_only: if True, restrict search to unseen; otherwise search all
         - lookback: number of most recent message ids to scan
+        - after: a :meth:`mailbox_mark`; only messages numbered above it count
         """
-        return await asyncio.wait_for(
-            asyncio.to_thread(self._fetch_latest_code_sync, subject_filters, unseen_only, lookback),
-            timeout=timeout,
-        )
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        deadline = time.monotonic() + timeout
+        try:
+            # The worker stops at the deadline itself; the grace only covers a hung
+            # IMAP command in flight at that moment.
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._IMAP_POOL,
+                    self._wait_for_code_sync,
+                    subject_filters,
+                    unseen_only,
+                    lookback,
+                    after,
+                    deadline,
+                    stop,
+                ),
+                timeout=timeout + self.POLL_INTERVAL,
+            )
+        finally:
+            # Cancelled or timed out: don't keep polling (and holding the connection)
+            stop.set()
+
+    def _wait_for_code_sync(
+        self,
+        subject_filters: Optional[list[str]],
+        unseen_only: bool,
+        lookback: int,
+        after: Optional[int],
+        deadline: float,
+        stop: threading.Event,
+    ) -> Optional[str]:
+        interval = self.MIN_POLL_INTERVAL
+        while True:
+            code = self._fetch_latest_code_sync(subject_filters, unseen_only, lookback, after)
+            remaining = deadline - time.monotonic()
+            if code is not None or remaining <= 0:
+                return code
+            # The connection lock is free while waiting, so other callers can use it
+            if stop.wait(min(interval, remaining)):
+                return None
+            interval = min(interval * 2, self.POLL_INTERVAL)
 
     def _fetch_latest_code_sync(
         self,
         subject_filters: Optional[list[str]] = None,
         unseen_only: bool = True,
         lookback: int = 50,
+        after: Optional[int] = None,
     ) -> Optional[str]:
         with self._client() as client:
             status, _ = client.select(self.folder)
             if status != "OK":
                 raise RuntimeError("Unable to select email folder")
 
-            criteria = "UNSEEN" if unseen_only else "ALL"
-            status, data = client.search(None, criteria)
+            subject_filters = [s.lower() for s in (subject_filters or [])]
+            # SUBJECT is a case-insensitive substring match done by the server;
+            # non-ASCII filters would need CHARSET literals, so those stay client-side.
+            server_side = all(sf.isascii() for sf in subject_filters)
+            criteria = ["UNSEEN" if unseen_only else "ALL"]
+            if subject_filters and server_side:
+                criteria.extend(self._subject_criteria(subject_filters))
+            status, data = client.search(None, *criteria)
             if status != "OK" or not data or not data[0]:
                 return None
 
-            ids = data[0].split()[-lookback:]
-            subject_filters = [s.lower() for s in (subject_filters or [])]
+            ids = data[0].split()
+            if after is not None:
+                ids = [msg_id for msg_id in ids if int(msg_id) > after]
+                if not ids:
+                    return None
+            ids = ids[-lookback:]
 
+            if subject_filters and not server_side:
+                # Cheap first pass over Subject headers only; skip bodies of non-matches
+                subjects = self._fetch_parts(client, ids, "(BODY.PEEK[HEADER.FIELDS (SUBJECT)])")
+                ids = [
+                    msg_id
+                    for msg_id in ids
+                    if any(
+                        sf in subjects.get(msg_id, b"").decode("utf-8", errors="ignore").lower()
+                        for sf in subject_filters
+                    )
+                ]
+                if not ids:
+                    return None
+
+            # One FETCH for the whole message set; PEEK leaves \Seen untouched
+            messages = self._fetch_parts(client, ids, "(BODY.PEEK[HEADER] BODY.PEEK[TEXT])")
             for msg_id in reversed(ids):
-                status, message_data = client.fetch(msg_id, "(RFC822.HEADER RFC822.TEXT)")
-                if status != "OK" or not message_data or not message_data[0]:
+                raw_email_bytes = messages.get(msg_id)
+                if not raw_email_bytes:
                     continue
-                raw_email_bytes = message_data[0][1]
-                text = raw_email_bytes.decode("utf-8", errors="ignore")
-                if subject_filters:
-                    subj_match = any(sf in text.lower() for sf in subject_filters)
-                    if not subj_match:
-                        continue
-                match = self.CODE_REGEX.search(text)
+                match = self.CODE_REGEX_BYTES.search(raw_email_bytes)
                 if match:
-                    return match.group(1)
+                    # Mark only the message we consumed, as the old RFC822 fetch did
+                    client.store(msg_id, "+FLAGS", "\\Seen")
+                    return match.group(1).decode("ascii")
             return None
 
+    @staticmethod
+    def _subject_criteria(subject_filters: List[str]) -> List[str]:
+        """IMAP SEARCH keys matching any of the filters (prefix ``OR`` is binary)."""
+        keys = []
+        for sf in subject_filters:
+            quoted = sf.replace("\\", "\\\\").replace('"', '\\"')
+            keys.append(f'SUBJECT "{quoted}"')
+        return ["OR"] * (len(keys) - 1) + keys
+
+    @staticmethod
+    def _fetch_parts(client: imaplib.IMAP4, ids: List[bytes], query: str) -> Dict[bytes, bytes]:
+        """FETCH ``query`` for all ``ids`` at once; returns id -> concatenated literals."""
+        status, data = client.fetch(b",".join(ids).decode("ascii"), query)
+        parts: Dict[bytes, bytes] = {}
+        if status != "OK" or not data:
+            return parts
+        msg_id = b""
+        for item in data:
+            # imaplib yields (b'<id> (<item> {<len>}', literal) for a message's first
+            # item, (b' <item> {<len>}', literal) for the rest, and b')' separators
+            if isinstance(item, tuple) and len(item) == 2:
+                head = item[0]
+                if head[:1].isdigit():
+                    msg_id = head.split(None, 1)[0]
+                parts[msg_id] = parts.get(msg_id, b"") + item[1]
+        return parts
+
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Mapping, Protocol
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import orjson
 
 
 class PageSession(Protocol):
@@ -15,31 +19,65 @@ class PageSession(Protocol):
     async def click(self, selector: str) -> None:
         ...
 
+    async def evaluate(self, expression: str, arg: Any = None) -> Any:
+        ...
+
 
 @dataclass
 class FieldMapping:
     selector: str
     value_key: str
+    # value_key of a field that must be filled first (e.g. a dependent dropdown);
+    # fields without one are filled together in one batch.
+    depends_on: Optional[str] = None
 
 
 class FormFiller:
     """Maps structured data to DOM selectors."""
 
+    PAYLOAD_CACHE_SIZE = 256
+
     def __init__(self, mapping: Iterable[FieldMapping]) -> None:
         self._mapping = list(mapping)
+        # "a || b" fallback selectors split once here instead of on every populate().
+        # Independent single-selector fields are batched through fill_all();
+        # fallbacks need each candidate tried in turn, so they stay sequential.
+        self._batched: List[Tuple[str, str]] = []
+        self._sequential: List[Tuple[Tuple[str, ...], str]] = []
+        for field in self._mapping:
+            if "||" in field.selector:
+                selectors = tuple(s.strip() for s in field.selector.split("||"))
+                self._sequential.append((selectors, field.value_key))
+            elif field.depends_on:
+                self._sequential.append(((field.selector,), field.value_key))
+            else:
+                self._batched.append((field.selector, field.value_key))
+        self._payloads: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
 
     async def populate(self, page: PageSession, data: Mapping[str, Any]) -> None:
-        for field in self._mapping:
-            value = data.get(field.value_key)
-            if value is None:
+        # Never concurrent page.fill calls: each focuses its element and types
+        # into whatever has focus, so overlapping fills can swap values.
+        await fill_all(
+            page,
+            [
+                (selector, value if isinstance(value, str) else str(value))
+                for selector, value_key in self._batched
+                if (value := data.get(value_key)) is not None
+            ],
+        )
+        for selectors, value_key in self._sequential:
+            value = data.get(value_key)
+            if value is not None:
+                await self._fill_one(page, selectors, value)
+
+    async def _fill_one(self, page: PageSession, selectors: Tuple[str, ...], value: Any) -> None:
+        text = value if isinstance(value, str) else str(value)
+        for sel in selectors:
+            try:
+                await page.fill(sel, text)
+                return
+            except Exception:
                 continue
-            selectors = [s.strip() for s in field.selector.split("||")] if "||" in field.selector else [field.selector]
-            for sel in selectors:
-                try:
-                    await page.fill(sel, str(value))
-                    break
-                except Exception:
-                    continue
 
     def build_payload(self, data: Mapping[str, Any]) -> Dict[str, Any]:
         """Create a mapping of selectors to values for API-based submissions."""
@@ -49,3 +87,59 @@ class FormFiller:
                 payload[field.selector] = data[field.value_key]
         return payload
 
+    def build_payload_cached(self, data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Like :meth:`build_payload`, memoized on the profile's content.
+
+        Keyed by a digest of the canonical JSON form, so an edited profile simply
+        misses the cache. The returned dict is shared and must not be mutated.
+        """
+        try:
+            key = hashlib.blake2b(
+                orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+            ).digest()
+        except TypeError:  # not JSON-serializable; nothing to key on
+            return self.build_payload(data)
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._payloads[key] = self.build_payload(data)
+            if len(self._payloads) > self.PAYLOAD_CACHE_SIZE:
+                self._payloads.popitem(last=False)
+        else:
+            self._payloads.move_to_end(key)
+        return payload
+
+
+# Fills (selector, value) pairs in one round-trip; returns the selectors it
+# could not resolve (non-CSS engines such as xpath= or text=).
+_FILL_ALL_JS = """pairs => pairs.filter(([s, v]) => {
+    let el = null;
+    try { el = document.querySelector(s); } catch (e) {}
+    if (!el) return true;
+    el.value = v;
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    return false;
+}).map(([s]) => s)"""
+
+
+async def fill_all(page, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[str, Exception]]:
+    """Fill every (selector, value) pair, in a single evaluate where possible.
+
+    Pairs the in-page query cannot resolve, or all of them if the evaluate
+    itself fails, go through ``page.fill`` one at a time. Failures are returned
+    as (selector, error) rather than raised, so one bad field never stops the rest.
+    """
+    if not pairs:
+        return []
+    try:
+        missed = set(await page.evaluate(_FILL_ALL_JS, [list(pair) for pair in pairs]))
+    except Exception:
+        missed = {selector for selector, _ in pairs}
+    failures: List[Tuple[str, Exception]] = []
+    for selector, value in pairs:
+        if selector in missed:
+            try:
+                await page.fill(selector, value)
+            except Exception as exc:
+                failures.append((selector, exc))
+    return failures
@@ -3,11 +3,113 @@
 from __future__ import annotations
 
 import asyncio
+import random
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
 
 import httpx
 
+# Rate limiting and transient upstream failures; anything else is final.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Upper bound for a server-requested Retry-After wait.
+MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:  # HTTP-date form; fall back to our own backoff
+        return None
+
+
+async def with_backoff(
+    send: Callable[[], Awaitable[httpx.Response]],
+    *,
+    retries: int = 5,
+    initial: float = 0.2,
+    max_delay: float = 5.0,
+    statuses: frozenset = RETRY_STATUSES,
+    retry_transport_errors: bool = True,
+) -> httpx.Response:
+    """Call ``send`` until it succeeds, backing off exponentially with jitter.
+
+    Transport errors and responses with a status in ``statuses`` are retried,
+    honouring ``Retry-After``; after ``retries`` attempts the last response is
+    returned (or error raised).
+
+    For non-idempotent requests pass ``retry_transport_errors=False``: only
+    failures to connect are retried then, since any later error (read timeout,
+    dropped connection) may come after the server already acted on the request.
+    """
+    delay = initial
+    for attempt in range(1, retries + 1):
+        wait = delay + random.random() * 0.1
+        try:
+            response = await send()
+        except httpx.TransportError as exc:
+            if attempt == retries or not (
+                retry_transport_errors or isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+            ):
+                raise
+        else:
+            if response.status_code not in statuses or attempt == retries:
+                return response
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                wait = max(wait, min(retry_after, MAX_RETRY_AFTER))
+            await response.aclose()
+        await asyncio.sleep(wait)
+        delay = min(delay * 2, max_delay)
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+class SessionClient:
+    """Per-session view over the shared client that keeps its own cookie jar.
+
+    Redirects are followed here rather than by httpx so every hop's
+    ``Set-Cookie`` lands in this session's jar.
+    """
+
+    __slots__ = ("_client", "_cookies")
+
+    MAX_REDIRECTS = 20
+
+    def __init__(self, client: httpx.AsyncClient, cookies: httpx.Cookies) -> None:
+        self._client = client
+        self._cookies = cookies
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        return self._cookies
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        request = self._client.build_request(method, url, **kwargs)
+        for _ in range(self.MAX_REDIRECTS + 1):
+            self._cookies.set_cookie_header(request)
+            response = await self._client.send(request, follow_redirects=False)
+            self._cookies.extract_cookies(response)
+            if response.next_request is None:
+                return response
+            await response.aclose()
+            request = response.next_request
+        raise httpx.TooManyRedirects("Exceeded maximum allowed redirects.", request=request)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
 
 class HttpClient:
     """Shared HTTP client with cookie persistence per session."""
@@ -15,31 +117,29 @@ class HttpClient:
     def __init__(self, base_url: str, *, timeout: float = 30.0) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self._clients: Dict[str, httpx.AsyncClient] = {}
-        self._lock = asyncio.Lock()
-
-    async def _ensure_client(self, session_id: str) -> httpx.AsyncClient:
-        async with self._lock:
-            if session_id not in self._clients:
-                self._clients[session_id] = httpx.AsyncClient(
-                    base_url=self.base_url,
-                    timeout=self.timeout,
-                    follow_redirects=True,
-                )
-            return self._clients[session_id]
+        # One connection pool for every session; only cookies are per session.
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cookies: Dict[str, httpx.Cookies] = {}
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                # The shared client must never keep cookies of its own, or they
+                # would leak between sessions; SessionClient manages them.
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            )
+        return self._client
 
     @asynccontextmanager
-    async def session(self, session_id: str) -> httpx.AsyncClient:
-        client = await self._ensure_client(session_id)
-        try:
-            yield client
-        finally:
-            # Keep client open for reuse; teardown occurs in close_all()
-            pass
+    async def session(self, session_id: str) -> AsyncIterator[SessionClient]:
+        cookies = self._cookies.setdefault(session_id, httpx.Cookies())
+        yield SessionClient(self._ensure_client(), cookies)
 
     async def close_all(self) -> None:
-        async with self._lock:
-            for client in self._clients.values():
-                await client.aclose()
-            self._clients.clear()
-
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        self._cookies.clear()
@@ -6,8 +6,9 @@ This module is optional. If the OpenAI Python SDK is not installed, importing
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class LLMError(RuntimeError):
@@ -15,7 +16,16 @@ class LLMError(RuntimeError):
 
 
 class LLMClient:
-    async def generate(self, *, system: str, user: str, temperature: float = 0.2) -> str:  # pragma: no cover
+    async def generate(
+        self,
+        *,
+        system: str,
+        user: str,
+        temperature: float = 0.2,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:  # pragma: no cover
+        """``response_format``/``max_tokens`` are hints; providers may ignore them."""
         raise NotImplementedError
 
 
@@ -26,41 +36,52 @@ class OpenAIClient(LLMClient):
 
     def __post_init__(self) -> None:
         try:  # Lazy import to keep dependency optional
-            from openai import OpenAI  # type: ignore
-
-            self._OpenAI = OpenAI
+            import openai  # type: ignore
         except Exception as exc:  # pragma: no cover - import-time failure only
             raise LLMError(
                 "OpenAI SDK not installed. Add 'llm' extra or install 'openai' package."
             ) from exc
 
-        # Create client
-        self._client = self._OpenAI(api_key=self.api_key)
-
-    async def generate(self, *, system: str, user: str, temperature: float = 0.2) -> str:
+        # Native async client: no executor hop per request. The sync client is
+        # only a fallback for SDK builds without AsyncOpenAI.
+        async_cls = getattr(openai, "AsyncOpenAI", None)
+        if async_cls is not None:
+            self._aclient = async_cls(api_key=self.api_key)
+            self._client = None
+        else:  # pragma: no cover - legacy SDKs only
+            self._aclient = None
+            self._client = openai.OpenAI(api_key=self.api_key)
+
+    async def generate(
+        self,
+        *,
+        system: str,
+        user: str,
+        temperature: float = 0.2,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
         # Use chat completions API for broad compatibility
+        kwargs: Dict[str, Any] = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens or 256,
+        )
+        if response_format is not None:
+            kwargs["response_format"] = response_format
         try:
-            resp = await self._to_thread(
-                self._client.chat.completions.create,
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": user},
-                ],
-                temperature=temperature,
-                max_tokens=256,
-            )
+            if self._aclient is not None:
+                resp = await self._aclient.chat.completions.create(**kwargs)
+            else:
+                resp = await asyncio.to_thread(self._client.chat.completions.create, **kwargs)
             return (resp.choices[0].message.content or "").strip()
         except Exception as exc:
             raise LLMError(str(exc))
 
-    # Minimal thread offload to avoid blocking event loop on sync client
-    async def _to_thread(self, func, /, *args, **kwargs):
-        import asyncio
-
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
-
 
 __all__ = ["LLMClient", "OpenAIClient", "LLMError"]
 
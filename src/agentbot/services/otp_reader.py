@@ -5,14 +5,25 @@ from __future__ import annotations
 import re
 from typing import Optional
 
+_DEFAULT_PATTERN = r"\b(\d{4,8})\b"
+# Deletes every ASCII digit; ASCII text unchanged by it has no digits at all.
+_DIGIT_TABLE = str.maketrans("", "", "0123456789")
+
 
 class OtpReader:
     """Simple OTP parser that extracts numeric codes from text blobs."""
 
-    def __init__(self, pattern: str = r"\b(\d{4,8})\b") -> None:
-        self._regex = re.compile(pattern)
+    def __init__(self, pattern: str = _DEFAULT_PATTERN) -> None:
+        # Keep the bound search method: parse() runs in OTP poll loops.
+        self._search = re.compile(pattern).search
+        # Only the default pattern is known to need at least four digits.
+        self._needs_digits = pattern == _DEFAULT_PATTERN
 
     def parse(self, text: str) -> Optional[str]:
-        match = self._regex.search(text)
+        if self._needs_digits and (
+            len(text) < 4 or (text.isascii() and text.translate(_DIGIT_TABLE) == text)
+        ):
+            # Non-ASCII text still goes to the regex, since \d matches Unicode digits.
+            return None
+        match = self._search(text)
         return match.group(1) if match else None
-
@@ -6,17 +6,138 @@ their purposes, and the correct sequence for filling them.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import re
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 from agentbot.services.llm import LLMClient
 from agentbot.utils.logging import get_logger
 
 logger = get_logger("PageAnalyzer")
 
+# Compiled once at import; used as a fallback when HTML parsing fails.
+_FORM_RE = re.compile(r'<form[^>]*>.*?</form>', re.DOTALL | re.IGNORECASE)
+_INPUT_RE = re.compile(r'<input[^>]*>', re.DOTALL | re.IGNORECASE)
+_FORM_ELEMENT_REGEXES = (
+    _FORM_RE,
+    _INPUT_RE,
+    re.compile(r'<button[^>]*>.*?</button>', re.DOTALL | re.IGNORECASE),
+    re.compile(r'<label[^>]*>.*?</label>', re.DOTALL | re.IGNORECASE),
+    re.compile(r'<textarea[^>]*>.*?</textarea>', re.DOTALL | re.IGNORECASE),
+    re.compile(r'<select[^>]*>.*?</select>', re.DOTALL | re.IGNORECASE),
+)
+# The lazy ``.*?</tag>`` patterns rescan to the end of the document for every
+# unclosed opening tag (quadratic on malformed HTML), so the fallback only
+# ever looks at this many characters.
+_REGEX_SCAN_LIMIT = 2_000_000
+_FIELDS_SYSTEM_PROMPT = """You are an expert at analyzing HTML forms and identifying input fields.
+Your task is to identify all form fields, their purposes, and create CSS/XPath selectors for them.
+
+IMPORTANT NOTES:
+- Look for Angular Material components (mat-form-field, matInput)
+- Handle multilingual labels (English, Turkish, etc.)
+- ID attributes are the most reliable selectors
+- Consider aria-invalid, type, name, and placeholder attributes
+
+Return a JSON array of form fields with this structure:
+{
+  "fields": [
+    {
+      "selector": "input#Email",
+      "field_type": "email",
+      "purpose": "email",
+      "label": "E-posta",
+      "placeholder": "jane.doe@email.com",
+      "required": true,
+      "confidence": 0.95
+    }
+  ]
+}
+
+Purpose values: email, password, username, phone, first_name, last_name, full_name, address, 
+city, country, postal_code, date_of_birth, passport_number, otp, captcha, checkbox, radio, select, text, unknown
+
+SELECTOR PRIORITY:
+1. ID (e.g., input#Email, input#Password) - MOST RELIABLE
+2. Type + ID (e.g., input[type="email"]#Email)
+3. Type + attributes (e.g., input[type="email"][name="Email"])
+4. XPath as last resort
+
+LABEL DETECTION:
+- Look for mat-label, label, aria-label
+- Common email labels: "Email", "E-mail", "E-posta", "电子邮件"
+- Common password labels: "Password", "Şifre", "密码", "Parola"
+
+Set confidence to 0.95+ if you're very certain (has ID + correct type + clear label)."""
+
+_ACTIONS_SYSTEM_PROMPT = """You are an expert at analyzing web forms and determining the correct sequence to fill them.
+
+Your task is to create a step-by-step action sequence for filling a form.
+
+IMPORTANT:
+- Fill all required fields BEFORE clicking submit
+- Add small waits (200-500ms) between field fills for human-like behavior
+- Use simple, reliable selectors (prefer ID-based)
+- For disabled buttons, still include the click action (browser will enable it after fields are filled)
+
+Return a JSON array with this structure:
+{
+  "actions": [
+    {
+      "action_type": "fill",
+      "selector": "input#Email",
+      "description": "Fill email field",
+      "order": 1,
+      "value_source": "credentials.username",
+      "wait_after": 300
+    },
+    {
+      "action_type": "fill",
+      "selector": "input#Password",
+      "description": "Fill password field",
+      "order": 2,
+      "value_source": "credentials.password",
+      "wait_after": 300
+    },
+    {
+      "action_type": "click",
+      "selector": "button[type='submit']",
+      "description": "Click submit button",
+      "order": 3,
+      "value_source": null,
+      "wait_after": 0
+    }
+  ]
+}
+
+action_type values: fill, click, select, wait
+value_source: where to get the value (e.g., "credentials.username", "credentials.password", "profile.first_name")
+order: sequence number (1, 2, 3, ...)
+wait_after: milliseconds to wait after this action (100-1000ms, 0 for last action)"""
+
+_FUSED_SYSTEM_PROMPT = (
+    _FIELDS_SYSTEM_PROMPT
+    + "\n\n"
+    + _ACTIONS_SYSTEM_PROMPT
+    + """
+
+You are doing BOTH tasks in one reply. Return ONE JSON object that contains both arrays:
+{"fields": [...], "actions": [...]}
+The actions must use the selectors you identified in "fields"."""
+)
+
+_FORM_ELEMENT_TAGS = ("input", "button", "label", "textarea", "select")
+_INPUT_ATTR_RE = re.compile(r'\b(id|name|type|placeholder)\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+
 
 class FieldPurpose(str, Enum):
     """Purpose/type of a form field."""
@@ -50,7 +171,7 @@ class ActionType(str, Enum):
     WAIT = "wait"
 
 
-@dataclass
+@dataclass(slots=True)
 class FormField:
     """Represents a form field identified in the page."""
     selector: str
@@ -63,7 +184,7 @@ class FormField:
     attributes: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionStep:
     """Represents an action to perform."""
     action_type: ActionType
@@ -74,26 +195,214 @@ class ActionStep:
     wait_after: int = 0  # milliseconds to wait after action
 
 
-@dataclass
+@dataclass(slots=True)
 class PageAnalysis:
     """Complete analysis of a page."""
     url: str
-    form_fields: List[FormField]
-    action_sequence: List[ActionStep]
+    form_fields: Tuple[FormField, ...]
+    action_sequence: Tuple[ActionStep, ...]
     submit_button: Optional[ActionStep] = None
     has_captcha: bool = False
     has_otp: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # First field per purpose; analyses are cached and shared, so it's built once.
+    _by_purpose: Dict[FieldPurpose, FormField] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        for form_field in self.form_fields:
+            self._by_purpose.setdefault(form_field.purpose, form_field)
+
+    def field_for(self, purpose: FieldPurpose) -> Optional[FormField]:
+        """Return the first identified field with ``purpose``, if any."""
+        return self._by_purpose.get(purpose)
+
+
+_JSON_RESPONSE = {"type": "json_object"}
+_PURPOSE_MAP = {purpose.value: purpose for purpose in FieldPurpose}
+_ACTION_MAP = {action.value: action for action in ActionType}
+
+
+def _load_json(response: str) -> Dict[str, Any]:
+    """Parse an LLM JSON reply, tolerating markdown code fences or other wrapping.
+
+    The prompts ask for a single JSON object, so everything outside the
+    outermost braces is dropped.
+    """
+    start = response.find("{")
+    end = response.rfind("}")
+    if start != -1 and end > start:
+        response = response[start:end + 1]
+    return orjson.loads(response)
+
+
+_HEURISTIC_PURPOSES = {
+    "email": FieldPurpose.EMAIL,
+    "password": FieldPurpose.PASSWORD,
+    "tel": FieldPurpose.PHONE,
+    "checkbox": FieldPurpose.CHECKBOX,
+    "radio": FieldPurpose.RADIO,
+}
+
+
+def _heuristic_fields(form_html: str) -> List[FormField]:
+    """Cheap regex pre-pass over <input> tags, used to prompt for the action sequence."""
+    fields = []
+    for tag in _INPUT_RE.findall(form_html):
+        attrs = {key.lower(): value for key, value in _INPUT_ATTR_RE.findall(tag)}
+        input_type = attrs.get("type", "text").lower()
+        if input_type in ("hidden", "submit", "button"):
+            continue
+        if attrs.get("id"):
+            selector = f"input#{attrs['id']}"
+        elif attrs.get("name"):
+            selector = f"input[name='{attrs['name']}']"
+        else:
+            continue
+        fields.append(
+            FormField(
+                selector=selector,
+                field_type=input_type,
+                purpose=_HEURISTIC_PURPOSES.get(input_type, FieldPurpose.TEXT),
+                placeholder=attrs.get("placeholder"),
+                attributes=attrs,
+            )
+        )
+    return fields
+
+
+def _remap_selectors(
+    actions: List[ActionStep], heuristic: List[FormField], fields: List[FormField]
+) -> None:
+    """Point actions built from heuristic selectors at the LLM-identified ones."""
+    mapping = {}
+    for guess in heuristic:
+        key = guess.attributes.get("id") or guess.attributes.get("name")
+        match = next((f for f in fields if key and key in f.selector), None)
+        if match is not None:
+            mapping[guess.selector] = match.selector
+    for action in actions:
+        action.selector = mapping.get(action.selector, action.selector)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_path(value_source: str) -> Tuple[str, ...]:
+    """Split a dot-notation value source once; the same few paths recur on every page."""
+    return tuple(value_source.split("."))
+
+
+class _FormExtractor(HTMLParser):
+    """Single-pass collector for the outer HTML of forms and form elements.
+
+    Replaces one backtracking regex scan per tag type with one linear parse.
+    """
+
+    _CONTAINERS = frozenset(("form", "button", "label", "textarea", "select"))
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.forms: List[str] = []
+        self.elements: Dict[str, List[str]] = {tag: [] for tag in _FORM_ELEMENT_TAGS}
+        self._open: List[Tuple[str, List[str]]] = []
+
+    def _emit(self, text: str) -> None:
+        for _, parts in self._open:
+            parts.append(text)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        text = self.get_starttag_text() or ""
+        self._emit(text)
+        if tag == "input":
+            self.elements["input"].append(text)
+        elif tag in self._CONTAINERS:
+            self._open.append((tag, [text]))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        text = self.get_starttag_text() or ""
+        self._emit(text)
+        if tag == "input":
+            self.elements["input"].append(text)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._emit(f"</{tag}>")
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                _, parts = self._open.pop(index)
+                chunk = "".join(parts)
+                if tag == "form":
+                    self.forms.append(chunk)
+                else:
+                    self.elements[tag].append(chunk)
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._open:
+            self._emit(data)
 
 
 class PageAnalyzer:
     """AI-powered page analyzer for form detection and filling."""
 
-    def __init__(self, llm: LLMClient, *, max_html_length: int = 50000, enable_cache: bool = False):
+    # Entries kept per LRU cache (analyses and raw LLM responses).
+    CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        *,
+        max_html_length: int = 50000,
+        enable_cache: bool = False,
+        fused_prompt: bool = True,
+    ):
         self.llm = llm
         self.max_html_length = max_html_length
         self.enable_cache = enable_cache
-        self._cache: Dict[str, PageAnalysis] = {}
+        # One LLM round-trip for fields + actions instead of two sequential ones
+        self.fused_prompt = fused_prompt
+        # Keyed by a digest of the extracted form HTML rather than the URL, so the
+        # same form behind different URLs/query strings reuses one analysis.
+        self._cache: "OrderedDict[str, PageAnalysis]" = OrderedDict()
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def _digest(*parts: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _cache_get(self, cache: "OrderedDict[str, Any]", key: str) -> Any:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+
+    async def _generate(self, system: str, user: str, *, max_tokens: int) -> str:
+        """LLM call with a response cache keyed by the prompts (when caching is enabled)."""
+        key = self._digest(system, user) if self.enable_cache else ""
+        if self.enable_cache:
+            response = self._cache_get(self._response_cache, key)
+            if response is not None:
+                return response
+        # JSON mode keeps replies short and fence-free; max_tokens bounds decode time
+        response = await self.llm.generate(
+            system=system,
+            user=user,
+            temperature=0.1,
+            response_format=_JSON_RESPONSE,
+            max_tokens=max_tokens,
+        )
+        if self.enable_cache:
+            self._cache_put(self._response_cache, key, response)
+        return response
 
     async def analyze_page(self, html: str, page_url: str) -> PageAnalysis:
         """Analyze a page and extract form information.
@@ -105,23 +414,32 @@ class PageAnalyzer:
         Returns:
             PageAnalysis with identified fields and action sequence
         """
+        # Extract form-related HTML
+        form_html = self._extract_form_html(html)
+        
         # 🔄 Cache kontrolü
-        if self.enable_cache and page_url in self._cache:
-            logger.info(f"📦 Using cached analysis for {page_url}")
-            return self._cache[page_url]
+        cache_key = self._digest(form_html) if self.enable_cache else ""
+        if self.enable_cache:
+            cached = self._cache_get(self._cache, cache_key)
+            if cached is not None:
+                logger.info(f"📦 Using cached analysis for {page_url}")
+                return cached if cached.url == page_url else replace(cached, url=page_url)
         
         logger.info(f"🔍 Analyzing page: {page_url}")
         if not self.enable_cache:
             logger.info("   🔄 Fresh analysis (cache disabled)")
         
-        # Extract form-related HTML
-        form_html = self._extract_form_html(html)
-        
-        # Identify form fields
-        fields = await self.identify_form_fields(form_html, page_url)
-        
-        # Identify action sequence
-        actions = await self.identify_submit_sequence(form_html, fields, page_url)
+        if self.fused_prompt:
+            fields, actions = await self.identify_form_and_sequence(form_html, page_url)
+        else:
+            # Both calls run concurrently; the sequence prompt gets a heuristic
+            # field list and its selectors are remapped to the LLM's afterwards.
+            heuristic_fields = _heuristic_fields(form_html)
+            fields, actions = await asyncio.gather(
+                self.identify_form_fields(form_html, page_url),
+                self.identify_submit_sequence(form_html, heuristic_fields, page_url),
+            )
+            _remap_selectors(actions, heuristic_fields, fields)
         
         # Find submit button
         submit_button = next(
@@ -129,14 +447,20 @@ class PageAnalyzer:
             None
         )
         
-        # Detect special fields
-        has_captcha = any(f.purpose == FieldPurpose.CAPTCHA for f in fields)
-        has_otp = any(f.purpose == FieldPurpose.OTP for f in fields)
+        # Detect special fields in a single pass
+        has_captcha = has_otp = False
+        for f in fields:
+            purpose = f.purpose
+            if purpose is FieldPurpose.CAPTCHA:
+                has_captcha = True
+            elif purpose is FieldPurpose.OTP:
+                has_otp = True
         
+        # Frozen as tuples: cached analyses are shared between callers.
         analysis = PageAnalysis(
             url=page_url,
-            form_fields=fields,
-            action_sequence=actions,
+            form_fields=tuple(fields),
+            action_sequence=tuple(actions),
             submit_button=submit_button,
             has_captcha=has_captcha,
             has_otp=has_otp,
@@ -148,7 +472,7 @@ class PageAnalyzer:
         
         # Store in cache if enabled
         if self.enable_cache:
-            self._cache[page_url] = analysis
+            self._cache_put(self._cache, cache_key, analysis)
             logger.info(f"💾 Cached analysis for {page_url}")
         
         logger.info(f"✅ Analysis complete: {len(fields)} fields, {len(actions)} actions")
@@ -159,28 +483,28 @@ class PageAnalyzer:
         
         Extracts forms, inputs, buttons, labels, and related elements.
         """
-        # Simple extraction: look for form elements and their context
-        patterns = [
-            r'<form[^>]*>.*?</form>',
-            r'<input[^>]*>',
-            r'<button[^>]*>.*?</button>',
-            r'<label[^>]*>.*?</label>',
-            r'<textarea[^>]*>.*?</textarea>',
-            r'<select[^>]*>.*?</select>',
-        ]
-        
-        # Try to extract forms first
-        form_matches = re.findall(r'<form[^>]*>.*?</form>', html, re.DOTALL | re.IGNORECASE)
+        try:
+            extractor = _FormExtractor()
+            extractor.feed(html)
+            extractor.close()
+            forms, elements = extractor.forms, extractor.elements
+        except Exception:
+            # HTMLParser is lenient, but keep the regex path as a safety net
+            window = html[:_REGEX_SCAN_LIMIT]
+            forms = _FORM_RE.findall(window)
+            elements = {
+                tag: pattern.findall(window)
+                for tag, pattern in zip(_FORM_ELEMENT_TAGS, _FORM_ELEMENT_REGEXES[1:])
+            }
         
-        if form_matches:
+        if forms:
             # Use the first form (or concatenate if multiple)
-            form_html = '\n'.join(form_matches[:3])  # Max 3 forms
+            form_html = '\n'.join(forms[:3])  # Max 3 forms
         else:
             # No forms found, extract all form elements
             extracted = []
-            for pattern in patterns:
-                matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-                extracted.extend(matches[:20])  # Limit per pattern
+            for tag in _FORM_ELEMENT_TAGS:
+                extracted.extend(elements.get(tag, [])[:20])  # Limit per tag
             form_html = '\n'.join(extracted)
         
         # Truncate if too long
@@ -199,45 +523,7 @@ class PageAnalyzer:
         Returns:
             List of identified form fields
         """
-        system_prompt = """You are an expert at analyzing HTML forms and identifying input fields.
-Your task is to identify all form fields, their purposes, and create CSS/XPath selectors for them.
-
-IMPORTANT NOTES:
-- Look for Angular Material components (mat-form-field, matInput)
-- Handle multilingual labels (English, Turkish, etc.)
-- ID attributes are the most reliable selectors
-- Consider aria-invalid, type, name, and placeholder attributes
-
-Return a JSON array of form fields with this structure:
-{
-  "fields": [
-    {
-      "selector": "input#Email",
-      "field_type": "email",
-      "purpose": "email",
-      "label": "E-posta",
-      "placeholder": "jane.doe@email.com",
-      "required": true,
-      "confidence": 0.95
-    }
-  ]
-}
-
-Purpose values: email, password, username, phone, first_name, last_name, full_name, address, 
-city, country, postal_code, date_of_birth, passport_number, otp, captcha, checkbox, radio, select, text, unknown
-
-SELECTOR PRIORITY:
-1. ID (e.g., input#Email, input#Password) - MOST RELIABLE
-2. Type + ID (e.g., input[type="email"]#Email)
-3. Type + attributes (e.g., input[type="email"][name="Email"])
-4. XPath as last resort
-
-LABEL DETECTION:
-- Look for mat-label, label, aria-label
-- Common email labels: "Email", "E-mail", "E-posta", "电子邮件"
-- Common password labels: "Password", "Şifre", "密码", "Parola"
-
-Set confidence to 0.95+ if you're very certain (has ID + correct type + clear label)."""
+        system_prompt = _FIELDS_SYSTEM_PROMPT
 
         user_prompt = f"""Analyze this HTML form and identify all input fields:
 
@@ -261,45 +547,10 @@ Example from this page:
 Return JSON only, no markdown, no explanation."""
 
         try:
-            response = await self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                temperature=0.1
-            )
-            
-            # Extract JSON from response
-            response = response.strip()
-            if response.startswith("```"):
-                # Remove markdown code blocks
-                response = re.sub(r'^```(?:json)?\s*', '', response)
-                response = re.sub(r'```\s*$', '', response)
+            response = await self._generate(system_prompt, user_prompt, max_tokens=1024)
             
-            data = json.loads(response)
-            
-            fields = []
-            for item in data.get("fields", []):
-                try:
-                    purpose_str = item.get("purpose", "unknown").lower()
-                    # Map to enum
-                    try:
-                        purpose = FieldPurpose(purpose_str)
-                    except ValueError:
-                        purpose = FieldPurpose.UNKNOWN
-                    
-                    field_obj = FormField(
-                        selector=item["selector"],
-                        field_type=item.get("field_type", "text"),
-                        purpose=purpose,
-                        label=item.get("label"),
-                        placeholder=item.get("placeholder"),
-                        required=item.get("required", False),
-                        confidence=item.get("confidence", 0.5),
-                        attributes=item.get("attributes", {})
-                    )
-                    fields.append(field_obj)
-                except Exception as e:
-                    logger.warning(f"Failed to parse field: {e}, item: {item}")
-                    continue
+            data = _load_json(response)
+            fields = self._parse_fields(data.get("fields", []))
             
             logger.info(f"Identified {len(fields)} form fields")
             return fields
@@ -328,55 +579,13 @@ Return JSON only, no markdown, no explanation."""
         Returns:
             List of actions in the correct order
         """
-        fields_summary = "\n".join([
-            f"- {f.purpose.value}: {f.selector} (type: {f.field_type})"
-            for f in fields
-        ])
+        lines: List[str] = []
+        append = lines.append
+        for f in fields:
+            append(f"- {f.purpose.value}: {f.selector} (type: {f.field_type})")
+        fields_summary = "\n".join(lines)
         
-        system_prompt = """You are an expert at analyzing web forms and determining the correct sequence to fill them.
-
-Your task is to create a step-by-step action sequence for filling a form.
-
-IMPORTANT:
-- Fill all required fields BEFORE clicking submit
-- Add small waits (200-500ms) between field fills for human-like behavior
-- Use simple, reliable selectors (prefer ID-based)
-- For disabled buttons, still include the click action (browser will enable it after fields are filled)
-
-Return a JSON array with this structure:
-{
-  "actions": [
-    {
-      "action_type": "fill",
-      "selector": "input#Email",
-      "description": "Fill email field",
-      "order": 1,
-      "value_source": "credentials.username",
-      "wait_after": 300
-    },
-    {
-      "action_type": "fill",
-      "selector": "input#Password",
-      "description": "Fill password field",
-      "order": 2,
-      "value_source": "credentials.password",
-      "wait_after": 300
-    },
-    {
-      "action_type": "click",
-      "selector": "button[type='submit']",
-      "description": "Click submit button",
-      "order": 3,
-      "value_source": null,
-      "wait_after": 0
-    }
-  ]
-}
-
-action_type values: fill, click, select, wait
-value_source: where to get the value (e.g., "credentials.username", "credentials.password", "profile.first_name")
-order: sequence number (1, 2, 3, ...)
-wait_after: milliseconds to wait after this action (100-1000ms, 0 for last action)"""
+        system_prompt = _ACTIONS_SYSTEM_PROMPT
 
         user_prompt = f"""Create an action sequence for this form:
 
@@ -404,44 +613,10 @@ Example sequence:
 Return JSON only, no markdown, no explanation."""
 
         try:
-            response = await self.llm.generate(
-                system=system_prompt,
-                user=user_prompt,
-                temperature=0.1
-            )
-            
-            # Extract JSON from response
-            response = response.strip()
-            if response.startswith("```"):
-                response = re.sub(r'^```(?:json)?\s*', '', response)
-                response = re.sub(r'```\s*$', '', response)
+            response = await self._generate(system_prompt, user_prompt, max_tokens=1024)
             
-            data = json.loads(response)
-            
-            actions = []
-            for item in data.get("actions", []):
-                try:
-                    action_type_str = item.get("action_type", "fill").lower()
-                    try:
-                        action_type = ActionType(action_type_str)
-                    except ValueError:
-                        action_type = ActionType.FILL
-                    
-                    action = ActionStep(
-                        action_type=action_type,
-                        selector=item["selector"],
-                        description=item.get("description", ""),
-                        order=item.get("order", 0),
-                        value_source=item.get("value_source"),
-                        wait_after=item.get("wait_after", 0)
-                    )
-                    actions.append(action)
-                except Exception as e:
-                    logger.warning(f"Failed to parse action: {e}, item: {item}")
-                    continue
-            
-            # Sort by order
-            actions.sort(key=lambda x: x.order)
+            data = _load_json(response)
+            actions = self._parse_actions(data.get("actions", []))
             
             logger.info(f"Identified {len(actions)} actions in sequence")
             return actions
@@ -454,6 +629,100 @@ Return JSON only, no markdown, no explanation."""
             logger.error(f"Failed to identify action sequence: {e}")
             return []
 
+    async def identify_form_and_sequence(
+        self, html: str, page_url: str
+    ) -> Tuple[List[FormField], List[ActionStep]]:
+        """Identify form fields and the fill/submit sequence with a single LLM call.
+        
+        Args:
+            html: HTML content (preferably form-related)
+            page_url: URL for context
+            
+        Returns:
+            Tuple of (form fields, actions in the correct order)
+        """
+        user_prompt = f"""Analyze this HTML form, identify all input fields, and create the action sequence to fill and submit it:
+
+URL: {page_url}
+
+HTML:
+{html}
+
+INSTRUCTIONS:
+1. Find all input fields (look for <input>, matInput attributes) and identify their purpose
+2. Create simple, reliable selectors (prefer input#ID format)
+3. Create fill actions for each field in logical order, using the same selectors
+4. Map email/username fields to "credentials.username" and password fields to "credentials.password"
+5. Add 200-500ms wait_after each fill (human-like)
+6. Add click action for submit button at the end, even if it is disabled="true"
+
+Return JSON only ({{"fields": [...], "actions": [...]}}), no markdown, no explanation."""
+
+        try:
+            response = await self._generate(_FUSED_SYSTEM_PROMPT, user_prompt, max_tokens=2048)
+            
+            data = _load_json(response)
+            fields = self._parse_fields(data.get("fields", []))
+            actions = self._parse_actions(data.get("actions", []))
+            
+            logger.info(f"Identified {len(fields)} form fields and {len(actions)} actions")
+            return fields, actions
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            logger.debug(f"Response: {response}")
+            return [], []
+        except Exception as e:
+            logger.error(f"Failed to analyze form: {e}")
+            return [], []
+
+    def _parse_fields(self, items: List[Dict[str, Any]]) -> List[FormField]:
+        fields = []
+        for item in items:
+            try:
+                purpose_str = item.get("purpose", "unknown").lower()
+                purpose = _PURPOSE_MAP.get(purpose_str, FieldPurpose.UNKNOWN)
+                
+                field_obj = FormField(
+                    selector=item["selector"],
+                    field_type=item.get("field_type", "text"),
+                    purpose=purpose,
+                    label=item.get("label"),
+                    placeholder=item.get("placeholder"),
+                    required=item.get("required", False),
+                    confidence=item.get("confidence", 0.5),
+                    attributes=item.get("attributes", {})
+                )
+                fields.append(field_obj)
+            except Exception as e:
+                logger.warning(f"Failed to parse field: {e}, item: {item}")
+                continue
+        return fields
+
+    def _parse_actions(self, items: List[Dict[str, Any]]) -> List[ActionStep]:
+        actions = []
+        for item in items:
+            try:
+                action_type_str = item.get("action_type", "fill").lower()
+                action_type = _ACTION_MAP.get(action_type_str, ActionType.FILL)
+                
+                action = ActionStep(
+                    action_type=action_type,
+                    selector=item["selector"],
+                    description=item.get("description", ""),
+                    order=item.get("order", 0),
+                    value_source=item.get("value_source"),
+                    wait_after=item.get("wait_after", 0)
+                )
+                actions.append(action)
+            except Exception as e:
+                logger.warning(f"Failed to parse action: {e}, item: {item}")
+                continue
+        
+        # Sort by order
+        actions.sort(key=lambda x: x.order)
+        return actions
+
     def get_value_from_session(self, value_source: str, session_data: Dict[str, Any]) -> Optional[str]:
         """Extract value from session data using dot notation.
         
@@ -467,10 +736,9 @@ Return JSON only, no markdown, no explanation."""
         if not value_source:
             return None
         
-        parts = value_source.split(".")
         current = session_data
         
-        for part in parts:
+        for part in _split_path(value_source):
             if isinstance(current, dict):
                 current = current.get(part)
             else:
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, List
+
+import orjson
 
 from agentbot.agents.booking import BookingProvider
 from agentbot.agents.monitor import AvailabilityProvider
@@ -19,11 +21,32 @@ from agentbot.core.models import (
     AppointmentBookingResult,
 )
 from agentbot.data.session_store import SessionRecord
-from agentbot.services.email import EmailInboxService
-from agentbot.services.form_filler import FormFiller
-from agentbot.services.http_client import HttpClient
+from agentbot.services.http_client import with_backoff
 from agentbot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    import httpx
+
+    from agentbot.services.email import EmailInboxService
+    from agentbot.services.form_filler import FormFiller
+    from agentbot.services.http_client import HttpClient
+
+# Request bodies are serialized with orjson and sent as raw content.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# The booking submit is not idempotent: only retry statuses that mean the
+# server turned the request away without processing it.
+_SUBMIT_RETRY_STATUSES = frozenset({429, 503})
+# Error bodies (often full HTML pages) are only kept as a short snippet.
+_ERROR_BODY_LIMIT = 4096
+
+
+def _body_snippet(response: "httpx.Response") -> dict:
+    raw = response.content
+    return {
+        "body": raw[:_ERROR_BODY_LIMIT].decode("utf-8", "replace"),
+        "truncated": len(raw) > _ERROR_BODY_LIMIT,
+    }
+
 
 class ExampleAvailabilityProvider(AvailabilityProvider):
     """Example provider using HTTP polling."""
@@ -40,9 +63,9 @@ class ExampleAvailabilityProvider(AvailabilityProvider):
 
     async def check(self, session: SessionRecord) -> Iterable[AppointmentAvailability]:
         async with self.http_client.session(session.session_id) as client:
-            response = await client.get(self.availability_endpoint)
+            response = await with_backoff(lambda: client.get(self.availability_endpoint))
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
         slots: List[AppointmentAvailability] = []
         for item in data.get("slots", []):
@@ -81,7 +104,10 @@ class ExampleBookingProvider(BookingProvider):
     async def book(self, request: AppointmentBookingRequest, session: SessionRecord) -> AppointmentBookingResult:
         async with self.http_client.session(session.session_id) as client:
             # Trigger verification code
-            trigger_resp = await client.post(self.booking_endpoint, json={"slot_id": request.slot.slot_id})
+            trigger_body = orjson.dumps({"slot_id": request.slot.slot_id})
+            trigger_resp = await with_backoff(
+                lambda: client.post(self.booking_endpoint, content=trigger_body, headers=_JSON_HEADERS)
+            )
             trigger_resp.raise_for_status()
 
             code = await self.email_service.fetch_latest_code()
@@ -93,7 +119,7 @@ class ExampleBookingProvider(BookingProvider):
                     message="No verification code received",
                 )
 
-            form_payload = self.form_filler.build_payload(request.user_profile)
+            form_payload = self.form_filler.build_payload_cached(request.user_profile)
 
             payload = {
                 "slot_id": request.slot.slot_id,
@@ -103,17 +129,31 @@ class ExampleBookingProvider(BookingProvider):
                 "form_payload": form_payload,
             }
 
-            submit_resp = await client.post(self.submit_endpoint, json=payload)
+            submit_body = orjson.dumps(payload)
+            submit_resp = await with_backoff(
+                lambda: client.post(self.submit_endpoint, content=submit_body, headers=_JSON_HEADERS),
+                statuses=_SUBMIT_RETRY_STATUSES,
+                retry_transport_errors=False,
+            )
             if submit_resp.status_code >= 400:
                 return AppointmentBookingResult(
                     session_id=request.session_id,
                     success=False,
                     slot=request.slot,
                     message=f"Booking failed with HTTP {submit_resp.status_code}",
-                    raw_response={"body": submit_resp.text},
+                    raw_response=_body_snippet(submit_resp),
+                )
+            if "json" not in submit_resp.headers.get("content-type", ""):
+                # e.g. a Cloudflare interstitial served with 200
+                return AppointmentBookingResult(
+                    session_id=request.session_id,
+                    success=False,
+                    slot=request.slot,
+                    message="Booking returned a non-JSON response",
+                    raw_response=_body_snippet(submit_resp),
                 )
 
-            data = submit_resp.json()
+            data = orjson.loads(submit_resp.content)
             confirmation = data.get("confirmation_number")
             return AppointmentBookingResult(
                 session_id=request.session_id,
@@ -2,8 +2,73 @@
 
 from __future__ import annotations
 
-from typing import Optional, Any
+from typing import Any
 import asyncio
+import json
+import weakref
+
+# One in-flight Turnstile wait per page
+_page_locks: "weakref.WeakKeyDictionary[Any, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+_TURNSTILE_IFRAME = "iframe[src*='turnstile'], iframe[src*='challenges.cloudflare.com']"
+# The widget container is rendered before Cloudflare injects its iframe
+_TURNSTILE_WIDGET = f"div.cf-turnstile, {_TURNSTILE_IFRAME}"
+# Seconds given to an iframe-less challenge page ("Just a moment") to move on
+CHALLENGE_SETTLE = 2.0
+
+# Cloudflare challenge markers. Text banners ("Checking your browser", "Just a
+# moment", "DDoS protection by Cloudflare") are matched through the keywords
+# rather than Playwright-only ``:has-text`` selectors.
+_CHALLENGE_SELECTORS = (
+    _TURNSTILE_IFRAME,
+    "a[href*='cloudflare.com']",
+    ".cf-browser-verification",
+    "#challenge-form",
+    ".cf-challenge-form",
+    "[data-ray]",  # Cloudflare challenge attribute
+)
+# Grouped selector: one query returns the first match of any marker.
+_CHALLENGE_SELECTOR_GROUP = ", ".join(_CHALLENGE_SELECTORS)
+_CF_KEYWORDS = ("cloudflare", "checking your browser", "just a moment", "ddos protection")
+
+# Runs every DOM probe inside the page in one round-trip.
+_DETECT_CHALLENGE_JS = f"""() => {{
+    if (document.querySelector({json.dumps(_CHALLENGE_SELECTOR_GROUP)})) return true;
+    const text = ((document.body && document.body.innerText) || "").toLowerCase();
+    return {json.dumps(_CF_KEYWORDS)}.some((keyword) => text.includes(keyword));
+}}"""
+
+_TURNSTILE_TOKEN_JS = (
+    "() => !!document.querySelector('input[name=\"cf-turnstile-response\"]')?.value"
+)
+
+
+async def _wait_for_widget(page: Any, wait_time: int) -> None:
+    """Wait up to ``wait_time`` ms for the Turnstile widget to resolve.
+
+    On Playwright pages this returns as soon as the widget detaches or its
+    response token is populated; other pages just sleep for ``wait_time``.
+    """
+    if not hasattr(page, 'wait_for_function'):
+        await asyncio.sleep(wait_time / 1000.0)
+        return
+
+    pending = {
+        asyncio.ensure_future(
+            page.wait_for_selector(_TURNSTILE_IFRAME, state="detached", timeout=wait_time)
+        ),
+        asyncio.ensure_future(page.wait_for_function(_TURNSTILE_TOKEN_JS, timeout=wait_time)),
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # A timeout on one signal is not resolution; keep waiting on the other
+            if any(task.exception() is None for task in done):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
 
 async def await_turnstile_if_present(page: Any, *, timeout: int = 15000) -> None:
@@ -20,92 +85,79 @@ async def await_turnstile_if_present(page: Any, *, timeout: int = 15000) -> None
     
     Eğer Cloudflare challenge tetiklenirse, BQL stealth ile aşın.
     If Cloudflare challenge is triggered, bypass it with BQL stealth.
+
+    Calls for the same page are serialized; a call arriving while another is
+    in progress waits for it and returns instead of starting a second wait.
     """
-    # Check if page is BrowserQLPage (has verify method)
-    if hasattr(page, 'verify_cloudflare_if_present'):
-        # BrowserQL: Use verify mutation to solve Cloudflare challenges automatically
-        try:
-            timeout_sec = timeout / 1000.0 if timeout else None
-            result = await page.verify_cloudflare_if_present(
+    lock = _page_locks.get(page)
+    if lock is None:
+        lock = _page_locks[page] = asyncio.Lock()
+    if lock.locked():
+        async with lock:
+            return
+    async with lock:
+        await _await_turnstile(page, timeout)
+
+
+async def _await_turnstile(page: Any, timeout: int) -> None:
+    # BrowserQL pages can solve the challenge server-side
+    if hasattr(page, 'verify_cloudflare_if_present') and await _bql_verify(page, timeout):
+        return
+
+    # Otherwise detect and wait (works for both Playwright and Hybrid mode)
+    try:
+        if not await page.query_selector(_TURNSTILE_WIDGET):
+            if await _detect_challenge(page):
+                # Challenge page without a widget: give it a moment to move on
+                await asyncio.sleep(CHALLENGE_SETTLE)
+            return
+        if not await page.query_selector(_TURNSTILE_IFRAME):
+            # Right after navigation only the container may be there yet
+            try:
+                await page.wait_for_selector(
+                    _TURNSTILE_IFRAME, state="attached", timeout=min(timeout, 5000)
+                )
+            except Exception:
+                return  # the widget never loaded; nothing to wait for
+        # Wait for widget to disappear or hand out its token
+        await _wait_for_widget(page, min(timeout, 15000))
+    except Exception:
+        pass
+
+
+async def _bql_verify(page: Any, timeout: int) -> bool:
+    """Run BrowserQL's verify mutation; True when a challenge was solved."""
+    try:
+        timeout_sec = timeout / 1000.0 if timeout else None
+        return bool(
+            await page.verify_cloudflare_if_present(
                 timeout=timeout_sec,
                 wait_for_navigation=True  # Wait for navigation after verification
             )
-            if result:
-                # Verification was performed and succeeded
-                return
-        except Exception:
-            # If verification fails, fall through to Playwright-style wait
-            pass
-    
-    # Check for Cloudflare challenge indicators (works for both Playwright and Hybrid mode)
-    challenge_indicators = [
-        "iframe[src*='turnstile']",
-        'a[href*="cloudflare.com"]',
-        'div:has-text("Checking your browser")',
-        'div:has-text("Just a moment")',
-        'div:has-text("DDoS protection by Cloudflare")',
-        '.cf-browser-verification',
-        '#challenge-form',
-        '.cf-challenge-form',
-        '[data-ray]',  # Cloudflare challenge attribute
-    ]
-    
-    challenge_detected = False
-    for indicator in challenge_indicators:
-        try:
-            element = await page.query_selector(indicator)
-            if element:
-                challenge_detected = True
-                break
-        except Exception:
-            continue
-    
-    # Also check page content for Cloudflare indicators
-    if not challenge_detected:
-        try:
-            content = await page.content()
-            if any(indicator in content.lower() for indicator in [
-                "cloudflare",
-                "checking your browser",
-                "just a moment",
-                "ddos protection"
-            ]):
-                challenge_detected = True
-        except Exception:
-            pass
-    
-    # If challenge detected, wait for it to resolve
-    if challenge_detected:
-        try:
-            # Wait for turnstile widget to resolve or disappear
-            widget = await page.query_selector("iframe[src*='turnstile']")
-            if widget:
-                # Wait for widget to disappear or become invisible
-                wait_time = min(timeout, 15000)
-                if hasattr(page, 'wait_for_timeout'):
-                    await page.wait_for_timeout(wait_time)
-                else:
-                    await asyncio.sleep(wait_time / 1000.0)
-            
-            # For Hybrid mode: BQL stealth should handle challenges during initialization,
-            # but we wait a bit more to ensure navigation completes
-            if hasattr(page, 'wait_for_timeout'):
-                await page.wait_for_timeout(2000)
-            else:
-                await asyncio.sleep(2.0)
-        except Exception:
-            pass
-    else:
-        # No challenge detected, but still wait briefly for any async turnstile widgets
+        )
+    except Exception:
+        # If verification fails, fall through to Playwright-style wait
+        return False
+
+
+async def _detect_challenge(page: Any) -> bool:
+    """Whether the page shows any Cloudflare challenge marker."""
+    if hasattr(page, 'evaluate'):
+        # Playwright / Hybrid: one evaluate instead of a CDP round-trip per
+        # selector plus a full page.content() serialization
         try:
-            widget = await page.query_selector("iframe[src*='turnstile']")
-            if widget:
-                wait_time = min(timeout, 5000)
-                if hasattr(page, 'wait_for_timeout'):
-                    await page.wait_for_timeout(wait_time)
-                else:
-                    await asyncio.sleep(wait_time / 1000.0)
+            return bool(await page.evaluate(_DETECT_CHALLENGE_JS))
         except Exception:
-            pass
-
+            return False
 
+    try:
+        if await page.query_selector(_CHALLENGE_SELECTOR_GROUP) is not None:
+            return True
+    except Exception:
+        pass
+    # Also check page content for Cloudflare indicators
+    try:
+        content = (await page.content()).lower()
+    except Exception:
+        return False
+    return any(indicator in content for indicator in _CF_KEYWORDS)
@@ -9,42 +9,69 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import functools
+import hashlib
+import logging
 import re
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, AsyncIterator, ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from playwright.async_api import Locator, Page, TimeoutError as PlaywrightTimeoutError
+import orjson
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from agentbot.agents.booking import BookingProvider
 from agentbot.agents.monitor import AvailabilityProvider
-from agentbot.browser.play import BrowserFactory
-from agentbot.browser.humanlike import humanlike_click
+from agentbot.browser.humanlike import humanlike_click, humanlike_hover, humanlike_press
+from agentbot.browser.locators import cached_locator, forget_page
 from agentbot.core.models import (
     AppointmentAvailability,
     AppointmentBookingRequest,
     AppointmentBookingResult,
 )
-from agentbot.data.session_store import SessionRecord, SessionStore
-from agentbot.services.email import EmailInboxService
-from agentbot.services.form_filler import FormFiller
-from agentbot.services.llm import LLMClient
+from agentbot.data.session_store import SessionRecord
+from agentbot.services.form_filler import fill_all
+from agentbot.services.http_client import HttpClient
 from agentbot.services.page_analyzer import PageAnalyzer, ActionType, FieldPurpose
 from agentbot.utils.logging import get_logger
+from agentbot.utils.ratelimit import RateLimiter
 from .turnstile import await_turnstile_if_present
-from agentbot.utils.artifacts import save_screenshot
-from agentbot.app.models import AppState
+from agentbot.utils.artifacts import forget_session, save_screenshot, schedule_screenshot
 
+if TYPE_CHECKING:  # annotations only; keeps import time down
+    from playwright.async_api import Locator, Page
 
+    from agentbot.browser.humanlike import LocatorLike
+    from agentbot.browser.play import BrowserFactory
+    from agentbot.core.availability_cache_redis import RedisAvailabilityCache
+    from agentbot.data.session_store import SessionStore
+    from agentbot.services.email import EmailInboxService
+    from agentbot.services.form_filler import FormFiller
+    from agentbot.services.llm import LLMClient
+
+
+SITE_URL = "https://visa.vfsglobal.com"
 LOGIN_URL = "https://visa.vfsglobal.com/tur/tr/fra/login"
 DASHBOARD_URL = "https://visa.vfsglobal.com/tur/tr/fra/dashboard"
 APPT_DETAIL_URL = "https://visa.vfsglobal.com/tur/tr/fra/application-detail"
 BOOK_URL = "https://visa.vfsglobal.com/tur/tr/fra/book-appointment"
+YOUR_DETAILS_URL = "https://visa.vfsglobal.com/tur/tr/fra/your-details"
 
 
 logger = get_logger("VFSFlow")
 
+# Shared by every session in the process, so a large fleet stays under the
+# providers' rate limits instead of tripping them and retrying.
+_LLM_LIMITER = RateLimiter(max_rate=10, time_period=1.0)
+_IMAP_LIMITER = RateLimiter(max_rate=4, time_period=1.0)
+
 
-@dataclass
 class VfsSelectors:
     """VFS site selectors using XPath and CSS.
     
@@ -55,36 +82,319 @@ class VfsSelectors:
     Test and update these selectors when the page structure changes.
     """
     # Login layout (XPath selectors derived from latest Turkish locale markup)
-    login_root: str = "xpath=//app-root[@class='d-flex flex-column min-vh-100']"
-    login_container: str = "xpath=//app-login[contains(@class, 'container py-15 py-md-30')]"
-    login_card: str = "xpath=//mat-card[contains(@class, 'mat-mdc-card mdc-card px-md-40 py-md-40')]"
-    login_form: str = "xpath=//form[@novalidate and @autocomplete='new-form']"
-    login_title: str = "xpath=//h1[contains(text(), 'Oturum Aç')]"
-    login_email_wrapper: str = "xpath=//mat-form-field[.//mat-label[text()='E-posta*']]"
-    login_password_wrapper: str = "xpath=//mat-form-field[.//mat-label[text()='Şifre*']]"
-    cloudflare_success: str = "xpath=//div[(contains(@class, 'cloudflare-success') or contains(text(), 'Başarılı!'))]"
-
-    # Login inputs and actions (with fallback selectors)
-    email: str = "xpath=//input[@id='Email' and @type='email']"
-    email_fallback: str = "input#Email, input[type='email'][id='Email'], input[type='email']"
-    password: str = "xpath=//input[@id='Password' and @type='password']"
-    password_fallback: str = "input#Password, input[type='password'][id='Password'], input[type='password']"
-    sign_in: str = "xpath=//button[normalize-space(text())='Oturum Aç']"
-    sign_in_fallback: str = 'button:has-text("Oturum Aç"), button:has-text("Sign In")'
-    otp: str = 'input[autocomplete="one-time-code"], input[type="password"]'
+    login_root: ClassVar[str] = "xpath=//app-root[@class='d-flex flex-column min-vh-100']"
+    login_container: ClassVar[str] = "xpath=//app-login[contains(@class, 'container py-15 py-md-30')]"
+    login_card: ClassVar[str] = "xpath=//mat-card[contains(@class, 'mat-mdc-card mdc-card px-md-40 py-md-40')]"
+    login_form: ClassVar[str] = "xpath=//form[@novalidate and @autocomplete='new-form']"
+    login_title: ClassVar[str] = "xpath=//h1[contains(text(), 'Oturum Aç')]"
+    login_email_wrapper: ClassVar[str] = "xpath=//mat-form-field[.//mat-label[text()='E-posta*']]"
+    login_password_wrapper: ClassVar[str] = "xpath=//mat-form-field[.//mat-label[text()='Şifre*']]"
+    cloudflare_success: ClassVar[str] = "xpath=//div[(contains(@class, 'cloudflare-success') or contains(text(), 'Başarılı!'))]"
+
+    # Login inputs and actions (CSS where it matches the XPath exactly; with fallback selectors)
+    email: ClassVar[str] = "input#Email[type='email']"
+    email_fallback: ClassVar[str] = "input#Email, input[type='email'][id='Email'], input[type='email']"
+    password: ClassVar[str] = "input#Password[type='password']"
+    password_fallback: ClassVar[str] = "input#Password, input[type='password'][id='Password'], input[type='password']"
+    sign_in: ClassVar[str] = "xpath=//button[normalize-space(text())='Oturum Aç']"
+    sign_in_fallback: ClassVar[str] = 'button:has-text("Oturum Aç"), button:has-text("Sign In")'
+    otp: ClassVar[str] = 'input[autocomplete="one-time-code"], input[type="password"]'
 
     # Misc navigation (CSS maintained where XPath not provided)
-    start_booking: str = 'button:has-text("Start New Booking"), a:has-text("Start New Booking")'
-    app_centre: str = 'label:has-text("Choose your Application Centre") ~ *'
-    category: str = 'label:has-text("Choose your appointment category") ~ *'
-    subcategory: str = 'label:has-text("Choose your sub-category") ~ *'
-    save_next: str = 'button:has-text("Save"), button:has-text("Next"), button:has-text("Continue")'
-    calendar_cell: str = '[role="gridcell"], .mat-calendar-body-cell:not(.mat-calendar-body-disabled)'
-    time_slot: str = '.time-slots button, .slot button, button:has-text("AM"), button:has-text("PM")'
-    confirm: str = 'button:has-text("Book"), button:has-text("Confirm"), button:has-text("Proceed")'
+    start_booking: ClassVar[str] = 'button:has-text("Start New Booking"), a:has-text("Start New Booking")'
+    app_centre: ClassVar[str] = 'label:has-text("Choose your Application Centre") ~ *'
+    category: ClassVar[str] = 'label:has-text("Choose your appointment category") ~ *'
+    subcategory: ClassVar[str] = 'label:has-text("Choose your sub-category") ~ *'
+    save_next: ClassVar[str] = 'button:has-text("Save"), button:has-text("Next"), button:has-text("Continue")'
+    calendar_cell: ClassVar[str] = '[role="gridcell"], .mat-calendar-body-cell:not(.mat-calendar-body-disabled)'
+    time_slot: ClassVar[str] = '.time-slots button, .slot button, button:has-text("AM"), button:has-text("PM")'
+    confirm: ClassVar[str] = 'button:has-text("Book"), button:has-text("Confirm"), button:has-text("Proceed")'
+    confirmation: ClassVar[str] = 'text=/confirmation|booking successful|reference number/i'
+
+
+# Either one means the login page has rendered (a single XPath union).
+_LOGIN_READY = "xpath=" + " | ".join(
+    selector.removeprefix("xpath=") for selector in (VfsSelectors.login_card, VfsSelectors.cloudflare_success)
+)
+
+# The sign-in button stays disabled until the form validates; the human-like
+# click moves the mouse and would not wait for that itself.
+_SIGN_IN_ENABLED = VfsSelectors.sign_in + "[not(@disabled)]"
+
+
+async def _wait_sign_in_enabled(page: Page, timeout: int = 2000) -> None:
+    try:
+        await page.wait_for_selector(_SIGN_IN_ENABLED, timeout=timeout)
+    except Exception:
+        pass  # the click falls back to the alternative selector anyway
+
+
+# Field keywords for the smart login-field lookup (Turkish and English labels)
+_EMAIL_KEYWORDS = ("email", "e-posta", "mail")
+_PASSWORD_KEYWORDS = ("password", "şifre")
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+@functools.lru_cache(maxsize=64)
+def _attribute_selector(input_selector: str, keywords: Tuple[str, ...]) -> str:
+    """CSS matching inputs whose id, name or formControlName contains a keyword."""
+    return ", ".join(
+        f"{input_selector}[{attr}*={_css_string(keyword)} i]"
+        for keyword in keywords
+        if keyword
+        for attr in ("id", "name", "formcontrolname")
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_keywords(keywords: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """One alternation over all keywords, so each strategy is a single locator."""
+    keywords = tuple(keyword for keyword in keywords if keyword)
+    if not keywords:
+        return None
+    return re.compile("|".join(f"(?:{keyword})" for keyword in keywords), re.IGNORECASE)
+
+
+# Parts of the booking page worth showing the no-slots classifier.
+_BOOKING_REGION = ".mat-calendar, .time-slots, .no-slots, .alert, main"
+# Nested matches (e.g. a calendar inside main) are skipped so text isn't repeated.
+_JOIN_TEXT_JS = """els => els
+    .filter(e => !els.some(o => o !== e && o.contains(e)))
+    .map(e => e.innerText)
+    .join("\\n")"""
+
+# Debug summary of the login page's inputs: total count and the first ten.
+_INPUTS_SUMMARY_JS = """() => {
+    const inputs = Array.from(document.querySelectorAll("input"));
+    return [inputs.length, inputs.slice(0, 10).map(i => ({
+        type: i.getAttribute("type"),
+        id: i.getAttribute("id"),
+        name: i.getAttribute("name"),
+        cls: i.getAttribute("class"),
+    }))];
+}"""
+
+# Reads what we report about each visible slot button in one round-trip.
+_SLOT_INFO_JS = """els => els.slice(0, 3).map(e => ({
+    text: (e.innerText || "").trim(),
+    time: e.dataset.time || null,
+    disabled: !!e.disabled,
+}))"""
+
+if sys.version_info >= (3, 11):
+    # fromisoformat understands a trailing "Z" natively from 3.11 on
+    _fromisoformat = dt.datetime.fromisoformat
+else:  # pragma: no cover - exercised on 3.10 only
+    def _fromisoformat(value: str) -> dt.datetime:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00") if value.endswith("Z") else value)
+
+# Each poll sees mostly the same calendar timestamps as the last one
+_parse_timestamp = functools.lru_cache(maxsize=4096)(_fromisoformat)
+
+
+# Callers wait for the elements they need, so navigation only waits for the
+# DOM and gives up early instead of waiting on slow third-party resources.
+NAV_OPTS = {"wait_until": "domcontentloaded", "timeout": 8000}
+
+
+def _is_network_error(exc: BaseException) -> bool:
+    # Timeouts are final (retrying would double the wait); net::ERR_* are transient
+    return (
+        isinstance(exc, PlaywrightError)
+        and not isinstance(exc, PlaywrightTimeoutError)
+        and "net::" in str(exc)
+    )
+
+
+async def _navigate(page: Page, url: str) -> None:
+    try:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential_jitter(initial=0.3, max=2.0, jitter=0.2),
+            retry=retry_if_exception(_is_network_error),
+            reraise=True,
+        ):
+            with attempt:
+                await page.goto(url, **NAV_OPTS)
+    except PlaywrightTimeoutError:
+        logger.debug("Navigation to %s timed out; continuing with the partial page", url)
+
+
+async def _goto_unless_there(page: Page, url: str, *, wait: float = 0) -> None:
+    """Navigate to ``url`` unless the flow already landed there.
+
+    With ``wait`` (ms), first give a just-clicked "next" that long to route
+    there by itself; the SPA updates the URL a moment after the click.
+    """
+    if wait and not page.url.startswith(url):
+        try:
+            await page.wait_for_url(lambda current: current.startswith(url), timeout=wait)
+        except PlaywrightTimeoutError:
+            pass
+    if not page.url.startswith(url):
+        await _navigate(page, url)
+
+
+# Booking references are upper-case alphanumerics (with dashes) containing a digit
+_REFERENCE_RE = re.compile(r"\b(?=[A-Z0-9-]*\d)[A-Z0-9][A-Z0-9-]{5,}\b")
+
+
+def _extract_reference(text: str) -> Optional[str]:
+    match = _REFERENCE_RE.search(text)
+    return match.group(0) if match else None
+
+
+def _prefetch(page: Page, url: str) -> Optional["asyncio.Task[None]"]:
+    """Load ``url`` in a throwaway tab of the page's context in the background.
+
+    The booking page's state depends on the earlier steps, so the tab is
+    never used itself; loading it warms the context's HTTP cache so the real
+    navigation later only fetches the document and its data.
+    """
+    context = getattr(page, "context", None)
+    if context is None or not hasattr(context, "new_page"):
+        return None
+
+    async def _load() -> None:
+        tab = None
+        try:
+            tab = await context.new_page()
+            await _navigate(tab, url)
+        except Exception:
+            logger.debug("Prefetch of %s failed", url, exc_info=True)
+        finally:
+            if tab is not None:
+                try:
+                    await tab.close()
+                except Exception:
+                    pass  # context already gone
+
+    return asyncio.create_task(_load())
+
+
+# Warm (monitor/login) pages skip what slot detection never looks at.
+# Stylesheets stay: visibility waits and the Turnstile widget depend on them.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+_BLOCKED_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar")
+
+
+async def _block_nonessential(route) -> None:
+    request = route.request
+    url = request.url
+    if "challenges.cloudflare.com" not in url and (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES or any(host in url for host in _BLOCKED_HOSTS)
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _slots_from_payload(data: dict, session: SessionRecord) -> List[AppointmentAvailability]:
+    """Build availabilities from a calendar/slot JSON payload (common shapes only)."""
+    items = data.get("slots") or data.get("data") or []
+    slots: List[AppointmentAvailability] = []
+    # Loop invariants hoisted: calendars can carry hundreds of slots
+    session_id = session.session_id
+    centre = session.preferences.get("centre")
+    append = slots.append
+    for item in items:
+        get = item.get
+        ts = get("start") or get("start_time") or get("datetime")
+        if not ts:
+            continue
+        try:
+            when = _parse_timestamp(ts)
+        except Exception:
+            continue
+        append(
+            AppointmentAvailability(
+                session_id=session_id,
+                slot_id=str(get("id") or get("slot_id") or when.isoformat()),
+                slot_time=when,
+                location=centre,
+                extra=item,
+            )
+        )
+    return slots
+
+
+# Request headers that belong to the browser's connection, not the API call.
+_CONNECTION_HEADERS = frozenset({"host", "content-length", "connection", "accept-encoding"})
+
+
+_SLOT_URL_RE = re.compile(r"calendar|slot")
+# The booking API call the confirm button sends; page navigations under
+# /book-appointment don't match
+_BOOKING_URL_RE = re.compile(r"/appointment/schedule\b")
+
+
+def _is_slot_response(response) -> bool:
+    # Runs for every response the page receives; the status test is the cheap one
+    return response.status == 200 and _SLOT_URL_RE.search(response.url) is not None
+
+
+def _is_booking_response(response) -> bool:
+    return response.request.method == "POST" and _BOOKING_URL_RE.search(response.url) is not None
+
+
+def _locators(page: Page) -> SimpleNamespace:
+    """Locators for the selectors polled in the monitor/booking loops.
+
+    Built once per page and reused while it is open (warm pages serve many
+    polls); Locators are lazy, so nothing is queried until they are awaited.
+    """
+    return SimpleNamespace(
+        calendar_cell=cached_locator(page, VfsSelectors.calendar_cell),
+        time_slot=cached_locator(page, VfsSelectors.time_slot),
+        save_next=cached_locator(page, VfsSelectors.save_next),
+        confirm=cached_locator(page, VfsSelectors.confirm),
+        confirmation=cached_locator(page, VfsSelectors.confirmation),
+    )
+
+
+_page_analyzers: Dict[int, PageAnalyzer] = {}
+
+
+def _shared_page_analyzer(llm: LLMClient) -> PageAnalyzer:
+    """One analyzer per LLM client, shared by every session's provider.
+
+    Its cache is keyed by a digest of the extracted form HTML, so all sessions
+    reuse one analysis of the (static) login form and a changed form is
+    analyzed afresh.
+    """
+    analyzer = _page_analyzers.get(id(llm))
+    if analyzer is None or analyzer.llm is not llm:
+        analyzer = _page_analyzers[id(llm)] = PageAnalyzer(llm, enable_cache=True)
+    return analyzer
 
 
 class VfsAvailabilityProvider(AvailabilityProvider):
+    # "No appointments" classifications are reused for identical page text
+    # within the TTL, so unchanged pages don't cost an LLM round-trip per poll.
+    CLASSIFY_CACHE_SIZE = 128
+    CLASSIFY_TTL = 60.0
+    # Pages with less visible text than this are not worth classifying.
+    MIN_CLASSIFY_TEXT = 40
+    CLASSIFY_TEXT_LIMIT = 1500
+    # Bounds for suggested_poll_interval, as multiples of the configured interval.
+    POLL_SCALE_MIN = 0.5
+    POLL_SCALE_MAX = 4.0
+    # How long a poll waits for the calendar/slot JSON before falling back.
+    SLOT_RESPONSE_TIMEOUT = 5.0
+    # Once the slot JSON request is known, polls replay it over HTTP with the
+    # browser's headers and cookies; the browser re-captures it this often.
+    SLOT_API_REFRESH = 300.0
+    # Warm pages kept open between calls; the least recently used idle one is
+    # closed beyond this, and idle ones are refreshed every KEEPALIVE_INTERVAL.
+    MAX_WARM_PAGES = 64
+    KEEPALIVE_INTERVAL = 60.0
+    # Once a field candidate is visible, more precise ones still pending get
+    # this long to show up too before the match is settled.
+    LOCATE_GRACE = 0.25
+
     def __init__(
         self,
         browser: BrowserFactory,
@@ -94,20 +404,102 @@ class VfsAvailabilityProvider(AvailabilityProvider):
         enable_ai_form_filling: bool = False,
         session_store: Optional["SessionStore"] = None,
         config: Optional[dict] = None,
+        cache: Optional["RedisAvailabilityCache"] = None,
     ) -> None:
         self.browser = browser
         self.email_service = email_service
         self.llm = llm
         self.enable_ai_form_filling = enable_ai_form_filling
-        self.page_analyzer = PageAnalyzer(llm, enable_cache=False) if llm and enable_ai_form_filling else None
+        self.page_analyzer = _shared_page_analyzer(llm) if llm and enable_ai_form_filling else None
         self.session_store = session_store
         self.config = config or {}
         self.mouse_config = self.config.get("humanlike_mouse", {})
+        # Shared across sessions polling the same centre/category
+        self.cache = cache
+        self._no_slots_cache: "OrderedDict[bytes, Tuple[float, bool]]" = OrderedDict()
+        # session id -> (page, its cleanup stack, queue fed by its response listener)
+        self._pages: "OrderedDict[str, Tuple[Page, AsyncExitStack, Optional[asyncio.Queue]]]" = OrderedDict()
+        self._page_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._page_used: Dict[str, float] = {}
+        self._keepalive: Optional[asyncio.Task[None]] = None
+        # session id -> (digest of the last slots seen, current poll interval scale)
+        self._churn: Dict[str, Tuple[bytes, float]] = {}
+        # session id -> (slot request URL, its headers, when captured)
+        self._slot_api: Dict[str, Tuple[str, Dict[str, str], float]] = {}
+        # Replays the learned slot requests; connections are pooled, cookies kept per session
+        self._http = HttpClient(SITE_URL, timeout=5.0)
 
     async def _click(self, page: Page, target: LocatorLike):
         """Helper to standardize clicks with configured behavior."""
         await humanlike_click(page, target, config=self.mouse_config)
 
+    async def _mark_inbox(self) -> Optional[int]:
+        """Inbox mark for :meth:`_fetch_otp_soon`; take it before the action that sends the mail.
+
+        None if the inbox can't be reached, in which case any unseen code counts.
+        """
+        try:
+            async with _IMAP_LIMITER:
+                return await self.email_service.mailbox_mark()
+        except Exception as exc:
+            logger.warning("Could not mark the inbox before the OTP mail: %s", exc)
+            return None
+
+    def _fetch_otp_soon(self, after: Optional[int]) -> "asyncio.Task[Optional[str]]":
+        """Start polling the inbox for the OTP mail in the background.
+
+        Only mail arriving after the ``after`` mark counts, so a code left
+        unread by an earlier attempt is never typed in. Callers cancel the
+        task once done so a skipped OTP step doesn't leave it running.
+        """
+        async def _fetch() -> Optional[str]:
+            async with _IMAP_LIMITER:
+                return await self.email_service.fetch_latest_code(
+                    timeout=90,
+                    subject_filters=["VFS", "one time password", "OTP"],
+                    unseen_only=True,
+                    lookback=30,
+                    after=after,
+                )
+
+        return asyncio.create_task(_fetch())
+
+    async def _page_says_no_slots(self, page: Page) -> bool:
+        """Ask the LLM whether the page text explicitly says nothing is available."""
+        text = ""
+        if hasattr(page, "eval_on_selector_all"):
+            # Only the booking region; page chrome is just extra tokens
+            text = await page.eval_on_selector_all(_BOOKING_REGION, _JOIN_TEXT_JS)
+        if not text.strip():
+            text = await page.inner_text("body")
+        snippet = text[: self.CLASSIFY_TEXT_LIMIT]
+        if len(snippet.strip()) < self.MIN_CLASSIFY_TEXT:
+            return False
+
+        key = hashlib.blake2b(snippet.encode("utf-8"), digest_size=8).digest()
+        now = time.monotonic()
+        cached = self._no_slots_cache.get(key)
+        if cached is not None and now - cached[0] < self.CLASSIFY_TTL:
+            self._no_slots_cache.move_to_end(key)
+            return cached[1]
+
+        async with _LLM_LIMITER:
+            answer = await self.llm.generate(
+                system=(
+                    "You classify appointment pages. Reply with exactly NO_SLOTS if the text "
+                    "explicitly says no appointments are available right now, otherwise SLOTS_AVAILABLE."
+                ),
+                user=snippet,
+                temperature=0.0,
+                max_tokens=8,
+            )
+        no_slots = answer.strip().upper().startswith("NO_SLOTS")
+        self._no_slots_cache[key] = (now, no_slots)
+        self._no_slots_cache.move_to_end(key)
+        if len(self._no_slots_cache) > self.CLASSIFY_CACHE_SIZE:
+            self._no_slots_cache.popitem(last=False)
+        return no_slots
+
     async def _smart_fill_with_locator(
         self,
         page: Page,
@@ -144,42 +536,83 @@ class VfsAvailabilityProvider(AvailabilityProvider):
         input_selector: str = "input",
         timeout: int = 4000,
     ) -> Optional[Locator]:
-        patterns = [re.compile(keyword, re.IGNORECASE) for keyword in keywords if keyword]
-        if not patterns:
+        pattern = _compile_keywords(tuple(keywords))
+        if pattern is None:
             return None
 
-        candidate_locators: List[tuple[str, Locator]] = []
-        for pattern in patterns:
-            candidate_locators.extend(
-                [
-                    (f"label:{pattern.pattern}", page.get_by_label(pattern)),
-                    (f"placeholder:{pattern.pattern}", page.get_by_placeholder(pattern)),
-                    (f"role:{pattern.pattern}", page.get_by_role("textbox", name=pattern)),
-                ]
-            )
-
-            mat_form = page.locator("mat-form-field").filter(has_text=pattern)
-            candidate_locators.append((f"mat-form-field:{pattern.pattern}", mat_form.locator(input_selector)))
+        # Most precise strategy first; keywords share one regex, so this is five
+        # locators however many keywords there are.
+        attr_selector = _attribute_selector(input_selector, tuple(keywords))
+        candidate_locators: List[tuple[str, Locator]] = [
+            ("role", page.get_by_role("textbox", name=pattern)),
+            ("label", page.get_by_label(pattern)),
+            ("placeholder", page.get_by_placeholder(pattern)),
+            (
+                "mat-form-field",
+                page.locator("mat-form-field").filter(has_text=pattern).locator(input_selector),
+            ),
+            ("attribute", page.locator(attr_selector)),
+        ]
 
-            keyword = pattern.pattern.replace("'", "\\'")
-            attr_selector = (
-                f"{input_selector}[id*=\"{keyword}\" i], "
-                f"{input_selector}[name*=\"{keyword}\" i], "
-                f"{input_selector}[formcontrolname*=\"{keyword}\" i]"
-            )
-            candidate_locators.append((f"attribute:{pattern.pattern}", page.locator(attr_selector)))
+        # Wait on every candidate at once: the worst case is one timeout instead
+        # of one per candidate. The first visible one is not taken outright:
+        # more precise candidates still pending get LOCATE_GRACE to appear, and
+        # the most precise visible one wins.
+        tasks = {
+            asyncio.ensure_future(candidate.first.wait_for(state="visible", timeout=timeout)): idx
+            for idx, (_, candidate) in enumerate(candidate_locators)
+        }
+        pending = set(tasks)
+        winner: Optional[int] = None
+        loop = asyncio.get_running_loop()
+        grace_ends = 0.0
+        try:
+            while pending:
+                if winner is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    better = {task for task in pending if tasks[task] < winner}
+                    remaining = grace_ends - loop.time()
+                    if not better or remaining <= 0:
+                        break
+                    done, _ = await asyncio.wait(
+                        better, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+                    pending -= done
+                for task in done:
+                    exc = task.exception()
+                    source = candidate_locators[tasks[task]][0]
+                    if exc is None:
+                        if winner is None:
+                            grace_ends = loop.time() + self.LOCATE_GRACE
+                        winner = tasks[task] if winner is None else min(winner, tasks[task])
+                    elif isinstance(exc, PlaywrightTimeoutError):
+                        logger.debug("Locator %s for %s timed out", source, debug_name)
+                    else:
+                        logger.debug("Locator %s for %s failed: %s", source, debug_name, exc)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if winner is None:
+            return None
+        source, candidate = candidate_locators[winner]
+        logger.debug("Located %s via %s", debug_name, source)
+        return candidate.first
 
-        for source, candidate in candidate_locators:
-            try:
-                handle = candidate.first
-                await handle.wait_for(state="visible", timeout=timeout)
-                logger.debug("Located %s via %s", debug_name, source)
-                return handle
-            except PlaywrightTimeoutError:
-                logger.debug("Locator %s for %s timed out", source, debug_name)
-            except Exception as exc:
-                logger.debug("Locator %s for %s failed: %s", source, debug_name, exc)
-        return None
+    async def _session_still_valid(self, page: Page) -> bool:
+        """Open the dashboard directly; a live session is not redirected to login."""
+        if not hasattr(page, "expect_response"):
+            # BrowserQL pages don't track client-side redirects in page.url
+            return False
+        await _navigate(page, DASHBOARD_URL)
+        try:
+            await page.wait_for_url(lambda url: "/login" in url, timeout=2000)
+        except PlaywrightTimeoutError:
+            return "/dashboard" in page.url
+        return False
 
     async def ensure_login(self, session: SessionRecord) -> None:
         # 🔄 Her seferinde fresh session data çek (eğer store varsa)
@@ -197,60 +630,70 @@ class VfsAvailabilityProvider(AvailabilityProvider):
         creds = session.credentials or {}
         username = creds.get("username", "")
         password = creds.get("password", "")
-        async with self.browser.page(session.session_id) as page:
-            await page.goto(LOGIN_URL, wait_until="domcontentloaded")
-            
-            # Önce zaten login olup olmadığını kontrol et
-            await asyncio.sleep(2)  # Biraz daha uzun bekleme, redirect ve JavaScript için
-            current_url = page.url
-            logger.info(f"Current URL after navigation: {current_url}")
-            
-            if "/dashboard" in current_url:
-                logger.info("Already logged in, skipping login flow")
+        async with self._using_page(session.session_id) as (page, _):
+            if await self._session_still_valid(page):
+                logger.info("Session cookie still valid, skipping login flow")
                 return
+            await _navigate(page, LOGIN_URL)
+            
+            if not hasattr(page, "expect_response"):
+                # BrowserQL: the dashboard probe is skipped, so check for a
+                # logged-in redirect here (redirect ve JavaScript için bekle)
+                await asyncio.sleep(2)
+                current_url = page.url
+                logger.info(f"Current URL after navigation: {current_url}")
+                
+                if "/dashboard" in current_url:
+                    logger.info("Already logged in, skipping login flow")
+                    return
             
             # İlk screenshot - sayfa yüklendikten hemen sonra
-            await save_screenshot(page, session.session_id, "01-after-navigation")
+            schedule_screenshot(page, session.session_id, "01-after-navigation")
             
             # Cloudflare challenge detection and bypass with BQL stealth
             # Eğer Cloudflare challenge tetiklenirse, BQL stealth ile aşın
             # await_turnstile_if_present automatically detects and handles challenges
             logger.info("Checking for Cloudflare challenge...")
             await await_turnstile_if_present(page, timeout=15000)
-            await save_screenshot(page, session.session_id, "02-after-turnstile")
+            schedule_screenshot(page, session.session_id, "02-after-turnstile")
             
             # Handle Cookie Consent Banner
             try:
                 logger.info("Checking for cookie consent banner...")
-                cookie_accept_button = page.locator("#onetrust-accept-btn-handler")
-                await cookie_accept_button.wait_for(state="visible", timeout=15000)
+                cookie_accept_button = cached_locator(page, "#onetrust-accept-btn-handler")
+                await cookie_accept_button.wait_for(state="visible", timeout=3000)
                 await self._click(page, cookie_accept_button)
                 logger.info("✓ Accepted all cookies.")
-                await page.wait_for_load_state("networkidle", timeout=10000) # Wait for page to settle
             except Exception as e:
                 logger.info(f"Cookie consent banner not found or failed to click: {e}")
 
-            # Sayfanın tam yüklenmesini bekle
-            logger.info("Waiting for page to fully load...")
+            # Login kartı (veya Cloudflare başarı mesajı) görünene kadar bekle;
+            # analytics yüzünden networkidle neredeyse hiç gelmiyor
+            logger.info("Waiting for the login form...")
             try:
-                await page.wait_for_load_state("networkidle", timeout=30000)
-                logger.info("Page reached networkidle state")
+                await page.wait_for_selector(_LOGIN_READY, timeout=8000)
+                logger.info("Login form is ready")
             except Exception as e:
-                logger.warning(f"Network idle timeout: {e}, continuing anyway")
+                logger.warning(f"Login form not ready yet: {e}, continuing anyway")
             
-            await save_screenshot(page, session.session_id, "03-after-networkidle")
+            schedule_screenshot(page, session.session_id, "03-login-ready")
             
-            # Sayfa içeriğini debug için kaydet
+            # Sayfa içeriği yalnızca AI analizi için (veya debug dökümü için) okunur
             page_content = ""
-            try:
-                page_content = await page.content()
-                from pathlib import Path
-                html_path = Path("artifacts") / session.session_id / "page-content.html"
-                html_path.parent.mkdir(parents=True, exist_ok=True)
-                html_path.write_text(page_content, encoding="utf-8")
-                logger.info(f"Page HTML saved to: {html_path}")
-            except Exception as e:
-                logger.warning(f"Failed to save page HTML: {e}")
+            dump_html = logger.isEnabledFor(logging.DEBUG)
+            if self.page_analyzer or dump_html:
+                try:
+                    page_content = await page.content()
+                except Exception as e:
+                    logger.warning(f"Failed to read page HTML: {e}")
+            if dump_html and page_content:
+                try:
+                    html_path = Path("artifacts") / session.session_id / "page-content.html"
+                    html_path.parent.mkdir(parents=True, exist_ok=True)
+                    html_path.write_text(page_content, encoding="utf-8")
+                    logger.debug(f"Page HTML saved to: {html_path}")
+                except Exception as e:
+                    logger.debug(f"Failed to save page HTML: {e}")
             
             # Try AI-powered form filling first
             if self.page_analyzer and page_content:
@@ -271,18 +714,17 @@ class VfsAvailabilityProvider(AvailabilityProvider):
             # Fallback: Manual selector-based form filling
             logger.info("Using manual selector-based form filling...")
             
-            # Sayfadaki tüm input elementlerini listele (debug)
-            try:
-                all_inputs = await page.query_selector_all("input")
-                logger.info(f"Found {len(all_inputs)} input elements on page")
-                for idx, inp in enumerate(all_inputs[:10]):  # İlk 10 input
-                    inp_type = await inp.get_attribute("type")
-                    inp_id = await inp.get_attribute("id")
-                    inp_name = await inp.get_attribute("name")
-                    inp_class = await inp.get_attribute("class")
-                    logger.info(f"  Input {idx}: type={inp_type}, id={inp_id}, name={inp_name}, class={inp_class}")
-            except Exception as e:
-                logger.warning(f"Failed to enumerate inputs: {e}")
+            # Sayfadaki tüm input elementlerini listele (debug; tek evaluate ile)
+            if logger.isEnabledFor(logging.DEBUG) and hasattr(page, "evaluate"):
+                try:
+                    total, inputs = await page.evaluate(_INPUTS_SUMMARY_JS)
+                    logger.debug(f"Found {total} input elements on page")
+                    for idx, inp in enumerate(inputs):  # İlk 10 input
+                        logger.debug(
+                            f"  Input {idx}: type={inp['type']}, id={inp['id']}, name={inp['name']}, class={inp['cls']}"
+                        )
+                except Exception as e:
+                    logger.debug(f"Failed to enumerate inputs: {e}")
             
             # Login form elementlerini daha esnek şekilde bekle
             logger.info("Looking for login form elements...")
@@ -299,7 +741,7 @@ class VfsAvailabilityProvider(AvailabilityProvider):
                 except Exception as e2:
                     # Son fallback: herhangi bir email input bekle
                     logger.error(f"✗ Email input not found with primary selector: {e2}")
-                    await save_screenshot(page, session.session_id, "04-login-error")
+                    await save_screenshot(page, session.session_id, "04-login-error", force=True)
                     logger.error(f"Current URL: {page.url}")
                     
                     # Tüm olası email input selector'larını dene
@@ -341,10 +783,9 @@ class VfsAvailabilityProvider(AvailabilityProvider):
             # Email input'un editable olmasını bekle
             email_filled = False
             try:
-                email_locator = page.locator(VfsSelectors.email).first
+                email_locator = cached_locator(page, VfsSelectors.email).first
                 await email_locator.wait_for(state="visible", timeout=10000)
                 await email_locator.fill(username)
-                await asyncio.sleep(0.3) # Add a small delay
                 logger.debug("Email filled successfully")
                 email_filled = True
             except Exception as e:
@@ -354,7 +795,7 @@ class VfsAvailabilityProvider(AvailabilityProvider):
                 try:
                     email_filled = await self._smart_fill_with_locator(
                         page,
-                        keywords=("email", "e-posta", "mail"),
+                        keywords=_EMAIL_KEYWORDS,
                         value=username,
                         debug_name="email",
                     )
@@ -376,7 +817,6 @@ class VfsAvailabilityProvider(AvailabilityProvider):
             password_filled = False
             try:
                 await page.fill(VfsSelectors.password, password)
-                await asyncio.sleep(0.4) # Add a small delay
                 logger.debug("Password filled successfully")
                 password_filled = True
             except Exception as e:
@@ -386,7 +826,7 @@ class VfsAvailabilityProvider(AvailabilityProvider):
                 try:
                     password_filled = await self._smart_fill_with_locator(
                         page,
-                        keywords=("password", "şifre"),
+                        keywords=_PASSWORD_KEYWORDS,
                         value=password,
                         debug_name="password",
                         input_selector='input[type="password"]',
@@ -405,128 +845,373 @@ class VfsAvailabilityProvider(AvailabilityProvider):
                     logger.error(f"Failed to fill password with fallback: {e2}")
                     raise
             
-            await save_screenshot(page, session.session_id, "before-login-submit")
+            schedule_screenshot(page, session.session_id, "before-login-submit")
             
+            await _wait_sign_in_enabled(page)
+            # OTP step: the mail is sent on submit, so the inbox is marked and the
+            # poll started right before the click; it runs through Turnstile and
+            # the OTP form load
+            email_task = self._fetch_otp_soon(after=await self._mark_inbox())
             try:
-                await self._click(page, VfsSelectors.sign_in)
-            except Exception:
-                await self._click(page, VfsSelectors.sign_in_fallback)
+                try:
+                    await self._click(page, VfsSelectors.sign_in)
+                except Exception:
+                    await self._click(page, VfsSelectors.sign_in_fallback)
             
-            # Cloudflare challenge may appear after login submit - bypass with BQL stealth
-            await await_turnstile_if_present(page, timeout=15000)
-            await save_screenshot(page, session.session_id, "after-login-submit")
+                # Cloudflare challenge may appear after login submit - bypass with BQL stealth
+                await await_turnstile_if_present(page, timeout=15000)
+                schedule_screenshot(page, session.session_id, "after-login-submit")
 
-            # OTP step
+                try:
+                    await page.wait_for_selector(VfsSelectors.otp, timeout=15000)
+                    logger.info("OTP input detected, waiting for email code")
+                    code = await email_task
+                    if code:
+                        logger.info(f"OTP code received: {code[:2]}***")
+                        await page.fill(VfsSelectors.otp, code)
+                        await _wait_sign_in_enabled(page)
+                        try:
+                            await self._click(page, VfsSelectors.sign_in)
+                        except Exception:
+                            await self._click(page, VfsSelectors.sign_in_fallback)
+                        await await_turnstile_if_present(page, timeout=15000)
+                    else:
+                        logger.warning("No OTP code received from email")
+                except Exception as e:
+                    logger.debug(f"OTP step skipped or failed: {e}")
+                    pass  # already logged in or bypassed
+            finally:
+                email_task.cancel()
+
+            await page.wait_for_url("**/dashboard", timeout=30000)
+            logger.info("Successfully logged in and reached dashboard")
+
+    async def _warm_page(self, session_id: str) -> Tuple[Page, Optional[asyncio.Queue]]:
+        """Return this session's long-lived monitor page, opening it on first use."""
+        self._page_used[session_id] = time.monotonic()
+        entry = self._pages.get(session_id)
+        if entry is not None:
+            # BrowserQL pages have no is_closed(); they live as long as the session
+            is_closed = getattr(entry[0], "is_closed", None)
+            if is_closed is None or not is_closed():
+                self._pages.move_to_end(session_id)
+                return entry[0], entry[2]
+            await self._drop_page(session_id)
+        await self._evict_idle_pages()
+        if self._keepalive is None or self._keepalive.done():
+            self._keepalive = asyncio.create_task(self._keepalive_loop(), name="vfs-page-keepalive")
+        stack = AsyncExitStack()
+        page = await stack.enter_async_context(self.browser.page(session_id))
+        responses: Optional[asyncio.Queue] = None
+        if hasattr(page, "route"):
+            await page.route("**/*", _block_nonessential)
+        if hasattr(page, "on"):
+            # Slot XHRs are collected for the page's lifetime, so a poll never
+            # misses one that fired during navigation.
+            responses = asyncio.Queue(maxsize=16)
+
+            def _on_response(response) -> None:
+                if _is_slot_response(response):
+                    try:
+                        responses.put_nowait(response)
+                    except asyncio.QueueFull:
+                        pass
+
+            page.on("response", _on_response)
+        self._pages[session_id] = (page, stack, responses)
+        return page, responses
+
+    @asynccontextmanager
+    async def _using_page(self, session_id: str) -> AsyncIterator[Tuple[Page, Optional[asyncio.Queue]]]:
+        """Hold this session's warm page exclusively; it is dropped if the caller fails."""
+        async with self._page_locks[session_id]:
+            page, responses = await self._warm_page(session_id)
             try:
-                await page.wait_for_selector(VfsSelectors.otp, timeout=15000)
-                logger.info("OTP input detected, waiting for email code")
-                code = await self.email_service.fetch_latest_code(
-                    timeout=90,
-                    subject_filters=["VFS", "one time password", "OTP"],
-                    unseen_only=True,
-                    lookback=30,
-                )
-                if code:
-                    logger.info(f"OTP code received: {code[:2]}***")
-                    await page.fill(VfsSelectors.otp, code)
-                    await asyncio.sleep(0.5)  # Add a small delay
+                yield page, responses
+            except BaseException:
+                await self._drop_page(session_id)
+                raise
+
+    async def _evict_idle_pages(self) -> None:
+        """Close least recently used pages nobody holds until there is room for one more."""
+        excess = len(self._pages) + 1 - self.MAX_WARM_PAGES
+        if excess <= 0:
+            return
+        for session_id in list(self._pages):
+            if excess <= 0:
+                break
+            # Checked right before each drop: closing the previous page awaits,
+            # and a poll may have taken this one meanwhile
+            if session_id not in self._pages or self._page_locks[session_id].locked():
+                continue
+            await self._drop_page(session_id)
+            excess -= 1
+
+    async def _keepalive_loop(self) -> None:
+        """Revisit the dashboard on pages idle for a while so their session stays warm."""
+        while self._pages:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL)
+            cutoff = time.monotonic() - self.KEEPALIVE_INTERVAL
+            for session_id in list(self._pages):
+                lock = self._page_locks[session_id]
+                if lock.locked() or self._page_used.get(session_id, 0.0) > cutoff:
+                    continue
+                async with lock:
+                    entry = self._pages.get(session_id)
+                    if entry is None:
+                        continue
                     try:
-                        await self._click(page, VfsSelectors.sign_in)
+                        await _navigate(entry[0], DASHBOARD_URL)
+                        self._page_used[session_id] = time.monotonic()
                     except Exception:
-                        await self._click(page, VfsSelectors.sign_in_fallback)
-                    await await_turnstile_if_present(page, timeout=15000)
-                else:
-                    logger.warning("No OTP code received from email")
-            except Exception as e:
-                logger.debug(f"OTP step skipped or failed: {e}")
-                pass  # already logged in or bypassed
+                        logger.debug("Keep-alive failed for %s", session_id, exc_info=True)
+                        await self._drop_page(session_id)
 
-            await page.wait_for_url("**/dashboard", timeout=30000)
-            logger.info("Successfully logged in and reached dashboard")
+    async def _drop_page(self, session_id: str) -> None:
+        self._page_used.pop(session_id, None)
+        forget_session(session_id)
+        entry = self._pages.pop(session_id, None)
+        if entry is not None:
+            forget_page(entry[0])
+            try:
+                await entry[1].aclose()
+            except Exception:
+                logger.debug("Failed to close monitor page for %s", session_id, exc_info=True)
+
+    async def _learn_slot_api(self, session_id: str, response) -> None:
+        """Remember the slot request the page made, headers and cookies included."""
+        request = getattr(response, "request", None)
+        if request is None or request.method != "GET" or not hasattr(request, "all_headers"):
+            return
+        headers = {
+            name: value
+            for name, value in (await request.all_headers()).items()
+            if not name.startswith(":") and name not in _CONNECTION_HEADERS
+        }
+        self._slot_api[session_id] = (response.url, headers, time.monotonic())
+
+    async def _probe_api(self, session: SessionRecord) -> Optional[List[AppointmentAvailability]]:
+        """Replay the learned slot request over plain HTTP; None means use the browser."""
+        session_id = session.session_id
+        api = self._slot_api.get(session_id)
+        if api is None:
+            return None
+        url, headers, learned_at = api
+        if time.monotonic() - learned_at > self.SLOT_API_REFRESH:
+            # Let the browser poll once to pick up fresh cookies
+            del self._slot_api[session_id]
+            return None
+        try:
+            # The captured Cookie header wins over the session jar, which only
+            # collects what the API itself sets
+            async with self._http.session(session_id) as client:
+                response = await client.get(url, headers=headers)
+            if response.status_code == 200 and "json" in response.headers.get("content-type", ""):
+                return _slots_from_payload(orjson.loads(response.content), session)
+            logger.info("Slot API answered %s for %s; back to the browser", response.status_code, session_id)
+        except Exception as exc:
+            logger.debug("Slot API request failed for %s: %s", session_id, exc)
+        self._slot_api.pop(session_id, None)
+        return None
+
+    async def aclose(self) -> None:
+        """Close the pages kept open between calls."""
+        keepalive, self._keepalive = self._keepalive, None
+        if keepalive is not None:
+            keepalive.cancel()
+            try:
+                await keepalive
+            except asyncio.CancelledError:
+                pass
+        for session_id in list(self._pages):
+            await self._drop_page(session_id)
+        await self._http.close_all()
+
+    def suggested_poll_interval(self, session_id: str, base: float) -> float:
+        """Scale the configured poll interval by how much this session's slots churn.
+
+        Each unchanged result doubles the interval (up to POLL_SCALE_MAX times
+        ``base``), each change halves it (down to POLL_SCALE_MIN times ``base``).
+        """
+        entry = self._churn.get(session_id)
+        return base * entry[1] if entry is not None else base
+
+    def _record_churn(self, session_id: str, slots: List[AppointmentAvailability]) -> None:
+        # slot_time of DOM-scraped slots is the poll time, so compare what the
+        # site reported (ids and raw slot data) instead
+        reported = orjson.dumps(
+            [(slot.slot_id, slot.extra) for slot in slots], option=orjson.OPT_SORT_KEYS, default=str
+        )
+        digest = hashlib.blake2b(reported, digest_size=8).digest()
+        previous = self._churn.get(session_id)
+        if previous is None:
+            scale = 1.0
+        elif previous[0] == digest:
+            scale = min(previous[1] * 2, self.POLL_SCALE_MAX)
+        else:
+            scale = max(previous[1] / 2, self.POLL_SCALE_MIN)
+        self._churn[session_id] = (digest, scale)
 
     async def check(self, session: SessionRecord) -> Iterable[AppointmentAvailability]:
+        slots = list(await self._check_cached(session))
+        self._record_churn(session.session_id, slots)
+        return slots
+
+    def _cache_key(self, session: SessionRecord) -> str:
+        prefs = session.preferences
+        return self.cache.key(prefs.get("centre"), prefs.get("category"), prefs.get("sub_category"))
+
+    async def _check_cached(self, session: SessionRecord) -> Iterable[AppointmentAvailability]:
+        if self.cache is None:
+            return await self._probe(session)
+        key = self._cache_key(session)
+        try:
+            cached = await self.cache.get(key, session.session_id)
+        except Exception as exc:
+            logger.warning("Availability cache read failed: %s", exc)
+            cached = None
+        if cached is not None and cached[0]:
+            return cached[1]
+        # One session per centre/category probes; the others wait for its result
+        token: Optional[str] = None
+        try:
+            token = await self.cache.claim_probe(key)
+            if token is None:
+                slots = await self.cache.wait_for_probe(key, session.session_id)
+                if slots is not None:
+                    return slots
+        except Exception as exc:
+            logger.warning("Availability probe coordination failed: %s", exc)
+        try:
+            return await self._probe_and_store(session, key, cached)
+        finally:
+            if token is not None:
+                try:
+                    await self.cache.release_probe(key, token)
+                except Exception as exc:
+                    logger.warning("Availability probe release failed: %s", exc)
+
+    async def _probe_and_store(
+        self,
+        session: SessionRecord,
+        key: str,
+        cached: Optional[Tuple[bool, List[AppointmentAvailability]]],
+    ) -> List[AppointmentAvailability]:
+        try:
+            slots = list(await self._probe(session))
+        except Exception:
+            if cached is None:
+                raise
+            logger.warning("Probe failed for %s; serving stale availability", session.session_id)
+            return cached[1]
+        try:
+            await self.cache.set(key, slots)
+        except Exception as exc:
+            logger.warning("Availability cache write failed: %s", exc)
+        return slots
+
+    async def _probe(self, session: SessionRecord) -> Iterable[AppointmentAvailability]:
+        slots = await self._probe_api(session)
+        if slots is not None:
+            return slots
+        # One warm page per session is reused across polls and logins instead
+        # of a fresh page (and browser context) each time.
+        async with self._using_page(session.session_id) as (page, responses):
+            return await self._check_page(page, responses, session)
+
+    async def _check_page(
+        self, page: Page, responses: Optional[asyncio.Queue], session: SessionRecord
+    ) -> List[AppointmentAvailability]:
         slots: List[AppointmentAvailability] = []
-        async with self.browser.page(session.session_id) as page:
-            await page.goto(BOOK_URL)
+        if responses is not None:
+            # Anything queued before this navigation belongs to the previous poll
+            while not responses.empty():
+                responses.get_nowait()
+        await _navigate(page, BOOK_URL)
 
-            # Try to capture JSON responses that include slots
-            try:
+        # Try to capture JSON responses that include slots. Only a timeout means
+        # "no slot XHR"; any other driver error (e.g. a crashed page) propagates
+        # so the warm page is dropped and the cache serves its stale result.
+        try:
+            if responses is None:
                 response = await page.wait_for_response(
-                    lambda r: ("calendar" in r.url or "slot" in r.url) and r.status == 200,
-                    timeout=5000,
+                    _is_slot_response, timeout=self.SLOT_RESPONSE_TIMEOUT * 1000
                 )
+            else:
                 try:
+                    response = responses.get_nowait()
+                except asyncio.QueueEmpty:
+                    # Navigation returns at DOMContentLoaded, usually before the
+                    # calendar XHR; the listener resolves this as soon as it lands
+                    response = await asyncio.wait_for(responses.get(), self.SLOT_RESPONSE_TIMEOUT)
+        except (PlaywrightTimeoutError, asyncio.TimeoutError):
+            response = None
+        if response is not None:
+            try:
+                # Parse the raw body here rather than through the driver's JSON
+                # round-trip (BrowserQL responses only offer json())
+                if hasattr(response, "body"):
+                    data = orjson.loads(await response.body())
+                else:
                     data = await response.json()
-                    # Attempt common shapes
-                    items = data.get("slots") or data.get("data") or []
-                    for item in items:
-                        ts = item.get("start") or item.get("start_time") or item.get("datetime")
-                        if not ts:
-                            continue
-                        try:
-                            when = dt.datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                        except Exception:
-                            continue
-                        slots.append(
-                            AppointmentAvailability(
-                                session_id=session.session_id,
-                                slot_id=str(item.get("id") or item.get("slot_id") or when.isoformat()),
-                                slot_time=when,
-                                location=session.preferences.get("centre"),
-                                extra=item,
-                            )
-                        )
-                    if slots:
-                        return slots
-                except Exception:
-                    pass
+                slots = _slots_from_payload(data, session)
+                if slots:
+                    # The endpoint's shape is proven; later polls can call it directly
+                    await self._learn_slot_api(session.session_id, response)
+                    return slots
             except Exception:
                 pass
 
-            # Optional LLM-assisted classification when no structured data is found
-            if not slots and self.llm:
-                try:
-                    body_text = await page.inner_text("body")
-                    snippet = body_text[:4000]
-                    answer = await self.llm.generate(
-                        system="You classify appointment pages.",
-                        user=(
-                            "Answer strictly 'yes' or 'no'. Does this text explicitly say no appointments are available right now?\n\n"
-                            + snippet
-                        ),
-                        temperature=0.0,
-                    )
-                    if answer.lower().strip().startswith("yes"):
-                        return []
-                except Exception:
-                    pass
-
-            # Fallback: parse DOM
+        # Optional LLM-assisted classification when no structured data is found
+        if not slots and self.llm:
             try:
-                await page.wait_for_selector(VfsSelectors.calendar_cell, timeout=10000)
-                # Try first enabled date cell
-                cells = await page.query_selector_all(VfsSelectors.calendar_cell)
-                if not cells:
-                    return slots
-                await self._click(page, cells[0])
-                await page.wait_for_selector(VfsSelectors.time_slot, timeout=5000)
-                await save_screenshot(page, session.session_id, "slots-visible")
-                t_buttons = await page.query_selector_all(VfsSelectors.time_slot)
-                for idx, btn in enumerate(t_buttons[:3]):
-                    ts = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
-                    slots.append(
-                        AppointmentAvailability(
-                            session_id=session.session_id,
-                            slot_id=f"dom-{idx}",
-                            slot_time=ts,
-                            location=session.preferences.get("centre", "VFS Centre"),
-                            extra={"dom_index": idx},
-                        )
-                    )
+                # A confident "nothing available" skips the DOM fallback
+                # and its waits entirely.
+                if await self._page_says_no_slots(page):
+                    return []
             except Exception:
-                logger.debug("No available slots detected via DOM")
+                pass
+
+        # Fallback: parse DOM
+        try:
+            loc = _locators(page)
+            # wait_for raises when no cell shows up, so no separate count() round-trip
+            await loc.calendar_cell.first.wait_for(timeout=10000)
+            await self._click(page, loc.calendar_cell.first)
+            await loc.time_slot.first.wait_for(timeout=5000)
+            schedule_screenshot(page, session.session_id, "slots-visible", every=10)
+            # One evaluate for every slot instead of an ElementHandle (and
+            # later a round-trip) per button; clicks go through loc.time_slot.nth(i)
+            slot_infos = await loc.time_slot.evaluate_all(_SLOT_INFO_JS)
+            for idx, info in enumerate(slot_infos):
+                ts = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+                slots.append(
+                    AppointmentAvailability(
+                        session_id=session.session_id,
+                        slot_id=f"dom-{idx}",
+                        slot_time=ts,
+                        location=session.preferences.get("centre", "VFS Centre"),
+                        extra={"dom_index": idx, **info},
+                    )
+                )
+        except Exception:
+            logger.debug("No available slots detected via DOM")
         return slots
 
+    async def _fill_batch(self, page, fills: List[Tuple[str, str]]) -> None:
+        """Fill and clear the pending (selector, value) pairs, in one round-trip where possible."""
+        if not fills:
+            return
+        pairs = fills[:]
+        fills.clear()
+        # Never raises: a field that fails is logged and the others still go in
+        failures = dict(await fill_all(page, pairs))
+        for selector, _ in pairs:
+            if selector in failures:
+                logger.warning("   ❌ Fill failed for %s: %s", selector, failures[selector])
+            else:
+                logger.info("   ✅ Filled %s", selector)
+
     async def _ai_form_fill(self, page, html_content: str, session: SessionRecord) -> bool:
         """Fill form using AI page analyzer.
         
@@ -542,15 +1227,16 @@ class VfsAvailabilityProvider(AvailabilityProvider):
             return False
         
         try:
-            # 🔄 HER SEFERINDE FRESH ANALIZ
-            logger.info("🔄 Starting fresh page analysis...")
+            # 🔄 Analiz form HTML'ine göre önbellekte tutulur; form değişince yeniden yapılır
+            logger.info("🔄 Starting page analysis...")
             logger.info(f"   Session ID: {session.session_id}")
             logger.info(f"   User: {session.email}")
             logger.info(f"   Page URL: {page.url}")
             
-            # Analyze the page (her seferinde yeniden)
+            # Analyze the page (identical login forms reuse the cached analysis)
             logger.info("📊 Analyzing page structure with AI...")
-            analysis = await self.page_analyzer.analyze_page(html_content, page.url)
+            async with _LLM_LIMITER:
+                analysis = await self.page_analyzer.analyze_page(html_content, page.url)
             
             if not analysis.form_fields:
                 logger.warning("⚠️ No form fields identified by AI")
@@ -575,75 +1261,91 @@ class VfsAvailabilityProvider(AvailabilityProvider):
             logger.info(f"   Profile fields: {len(session_data['profile'])}")
             logger.info(f"   Preferences: {len(session_data['preferences'])}")
             
+            # The actions below may send the OTP mail; only later mail counts
+            otp_mark = await self._mark_inbox() if analysis.has_otp else None
+
             # Execute action sequence
             if analysis.action_sequence:
                 logger.info(f"🎬 Executing {len(analysis.action_sequence)} actions in sequence...")
+                # Consecutive FILLs are collected and set in a single evaluate;
+                # anything else flushes them first, so the order is preserved.
+                fills: List[Tuple[str, str]] = []
+                # Every value source is resolved once up front; actions only look it up.
+                resolve = self.page_analyzer.get_value_from_session
+                resolved = {
+                    action.value_source: resolve(action.value_source, session_data)
+                    for action in analysis.action_sequence
+                    if action.value_source
+                }
+                # Waits are accumulated and slept in one go right before the next
+                # action that touches the page (consecutive waits coalesce).
+                pending_wait = 0
                 for action in analysis.action_sequence:
                     try:
-                        logger.info(f"▶️  Action {action.order}: {action.description}")
+                        logger.info("▶️  Action %s: %s", action.order, action.description)
+                        
+                        if action.action_type == ActionType.WAIT:
+                            wait_time = action.wait_after or 1000
+                            pending_wait += wait_time
+                            logger.info("   ⏱️  Waiting %sms", wait_time)
+                            continue
+                        
+                        if pending_wait:
+                            await self._fill_batch(page, fills)
+                            await asyncio.sleep(pending_wait / 1000)
+                            pending_wait = 0
                         
                         if action.action_type == ActionType.FILL:
-                            # 🔄 Her action için value'yu fresh oku
-                            value = self.page_analyzer.get_value_from_session(
-                                action.value_source or "", 
-                                session_data
-                            )
+                            value = resolved.get(action.value_source)
                             if value:
-                                logger.info(f"   📝 Value source: {action.value_source}")
-                                logger.info(f"   📝 Value length: {len(str(value))} chars")
-                                await page.fill(action.selector, value)
-                                logger.info(f"   ✅ Filled {action.selector}")
+                                logger.info("   📝 Value source: %s", action.value_source)
+                                logger.info("   📝 Value length: %d chars", len(value))
+                                fills.append((action.selector, str(value)))
+                                if action.wait_after > 0:
+                                    await self._fill_batch(page, fills)
                             else:
-                                logger.warning(f"   ⚠️  No value for {action.value_source}")
+                                logger.warning("   ⚠️  No value for %s", action.value_source)
+                        else:
+                            await self._fill_batch(page, fills)
                         
-                        elif action.action_type == ActionType.CLICK:
+                        if action.action_type == ActionType.CLICK:
                             await self._click(page, action.selector)
-                            logger.info(f"   ✅ Clicked {action.selector}")
+                            logger.info("   ✅ Clicked %s", action.selector)
                         
                         elif action.action_type == ActionType.SELECT:
                             if action.value_source:
-                                value = self.page_analyzer.get_value_from_session(
-                                    action.value_source, 
-                                    session_data
-                                )
+                                value = resolved.get(action.value_source)
                                 if value:
                                     await page.select_option(action.selector, value)
-                                    logger.info(f"   ✅ Selected {value} in {action.selector}")
-                        
-                        elif action.action_type == ActionType.WAIT:
-                            wait_time = action.wait_after or 1000
-                            await asyncio.sleep(wait_time / 1000)
-                            logger.info(f"   ⏱️  Waited {wait_time}ms")
+                                    logger.info("   ✅ Selected %s in %s", value, action.selector)
                         
                         # Wait after action if specified
-                        if action.wait_after > 0:
-                            await asyncio.sleep(action.wait_after / 1000)
+                        pending_wait += max(action.wait_after, 0)
                     
                     except Exception as e:
-                        logger.warning(f"   ❌ Action failed: {e}")
+                        logger.warning("   ❌ Action failed: %s", e)
                         # Don't fail completely, continue with next action
                         continue
+                await self._fill_batch(page, fills)
+                if pending_wait:
+                    await asyncio.sleep(pending_wait / 1000)
             
             # Take screenshot after form filling
-            await save_screenshot(page, session.session_id, "04-ai-form-filled")
+            schedule_screenshot(page, session.session_id, "04-ai-form-filled")
             
             # Check if we need to handle OTP
             if analysis.has_otp:
                 logger.info("Page requires OTP, waiting for email code...")
                 try:
                     # Wait for OTP field to appear
-                    otp_field = next(
-                        (f for f in analysis.form_fields if f.purpose == FieldPurpose.OTP),
-                        None
-                    )
+                    otp_field = analysis.field_for(FieldPurpose.OTP)
                     if otp_field:
-                        await page.wait_for_selector(otp_field.selector, timeout=15000)
-                        code = await self.email_service.fetch_latest_code(
-                            timeout=90,
-                            subject_filters=["VFS", "one time password", "OTP"],
-                            unseen_only=True,
-                            lookback=30,
-                        )
+                        email_task = self._fetch_otp_soon(after=otp_mark)
+                        try:
+                            await page.wait_for_selector(otp_field.selector, timeout=15000)
+                            code = await email_task
+                        finally:
+                            email_task.cancel()
                         if code:
                             logger.info(f"OTP code received: {code[:2]}***")
                             await page.fill(otp_field.selector, code)
@@ -661,6 +1363,8 @@ class VfsAvailabilityProvider(AvailabilityProvider):
 
 
 class VfsBookingProvider(BookingProvider):
+    __slots__ = ("browser", "email_service", "form_filler", "config", "mouse_config")
+
     def __init__(self, browser: BrowserFactory, *, email_service: EmailInboxService, form_filler: Optional[FormFiller] = None, config: Optional[dict] = None) -> None:
         self.browser = browser
         self.email_service = email_service
@@ -674,66 +1378,121 @@ class VfsBookingProvider(BookingProvider):
 
     async def book(self, request: AppointmentBookingRequest, session: SessionRecord) -> AppointmentBookingResult:
         async with self.browser.page(session.session_id) as page:
-            # Assume already logged in; navigate to appointment flow
-            await page.goto(APPT_DETAIL_URL)
-
-            # Step 1: selections from preferences
-            prefs = session.preferences
+            loc = _locators(page)
+            prefetch = _prefetch(page, BOOK_URL)
+            # Cancelled however the flow ends, so the throwaway tab never
+            # outlives the booking page
             try:
-                if centre := prefs.get("centre"):
-                    await self._click(page, VfsSelectors.app_centre)
-                    await self._click(page, page.get_by_text(str(centre), exact=False))
-                if category := prefs.get("category"):
-                    await self._click(page, VfsSelectors.category)
-                    await self._click(page, page.get_by_text(str(category), exact=False))
-                if sub := prefs.get("sub_category"):
-                    await self._click(page, VfsSelectors.subcategory)
-                    await self._click(page, page.get_by_text(str(sub), exact=False))
-                await self._click(page, VfsSelectors.save_next)
-            except Exception:
-                pass
+                # Assume already logged in; navigate to appointment flow
+                await _navigate(page, APPT_DETAIL_URL)
 
-            # Step 2: fill applicant details (optional, if required)
-            try:
-                await page.goto("https://visa.vfsglobal.com/tur/tr/fra/your-details")
-                if self.form_filler:
-                    await self.form_filler.populate(page, session.profile)
-                # Optional passport upload if provided
-                passport_path = session.profile.get("passport_image")
-                if passport_path:
-                    try:
-                        await page.set_input_files("input[type='file']", passport_path)
-                    except Exception:
-                        pass
-                await self._click(page, VfsSelectors.save_next)
-            except Exception:
-                pass
+                # Step 1: selections from preferences
+                prefs = session.preferences
+                try:
+                    # Sequential on purpose: the human-like clicks drive a single
+                    # mouse cursor, and each open dropdown overlays the next one.
+                    # The (dropdown, option) pairs are built up front so the click
+                    # sequence runs back to back. Options are looked up by ARIA role
+                    # (mat-option), so only the open list is searched, not every
+                    # text node on the page.
+                    picks = [
+                        (label, page.get_by_role("option", name=str(value)).first)
+                        for label, key in (
+                            (VfsSelectors.app_centre, "centre"),
+                            (VfsSelectors.category, "category"),
+                            (VfsSelectors.subcategory, "sub_category"),
+                        )
+                        if (value := prefs.get(key))
+                    ]
+                    for dropdown, option in picks:
+                        await self._click(page, dropdown)
+                        await self._click(page, option)
+                    await self._click(page, loc.save_next)
+                    advanced = True
+                except Exception:
+                    advanced = False
 
-            # Step 3: book appointment page
-            await page.goto(BOOK_URL)
-            try:
-                await page.wait_for_selector(VfsSelectors.time_slot, timeout=10000)
-                buttons = await page.query_selector_all(VfsSelectors.time_slot)
-                if not buttons:
+                # Step 2: fill applicant details (optional, if required)
+                try:
+                    await _goto_unless_there(page, YOUR_DETAILS_URL, wait=5000 if advanced else 0)
+                    if self.form_filler:
+                        await self.form_filler.populate(page, session.profile)
+                    # Optional passport upload if provided
+                    passport_path = session.profile.get("passport_image")
+                    if passport_path:
+                        try:
+                            await page.set_input_files("input[type='file']", passport_path)
+                        except Exception:
+                            pass
+                    await self._click(page, loc.save_next)
+                    advanced = True
+                except Exception:
+                    advanced = False
+
+                # Step 3: book appointment page. Only the prefetch's cached
+                # assets matter; don't wait on a slow load.
+                if prefetch is not None:
+                    prefetch.cancel()
+                await _goto_unless_there(page, BOOK_URL, wait=5000 if advanced else 0)
+                try:
+                    try:
+                        # Returns once a slot button is attached, so no count() round-trip
+                        await loc.time_slot.first.wait_for(timeout=10000)
+                    except PlaywrightTimeoutError:
+                        return AppointmentBookingResult(
+                            session_id=request.session_id,
+                            success=False,
+                            slot=request.slot,
+                            message="No slots visible at booking time",
+                        )
+                    await self._click(page, loc.time_slot.first)
+                    submit = None
+                    if hasattr(page, "expect_response"):
+                        # Watch for the booking API call the click triggers so a
+                        # rejected booking fails fast instead of waiting out the
+                        # confirmation timeout. The window opens after the mouse
+                        # has reached the button, so it covers the press alone.
+                        confirm = await humanlike_hover(page, loc.confirm, config=self.mouse_config)
+                        try:
+                            async with page.expect_response(_is_booking_response, timeout=1000) as submitted:
+                                await humanlike_press(page, confirm, config=self.mouse_config)
+                            submit = await submitted.value
+                        except PlaywrightTimeoutError:
+                            pass
+                    else:
+                        await self._click(page, loc.confirm)
+                    if submit is not None and submit.status >= 400:
+                        return AppointmentBookingResult(
+                            session_id=request.session_id,
+                            success=False,
+                            slot=request.slot,
+                            message=f"Booking rejected with HTTP {submit.status}",
+                        )
+                    # Only report success once the site confirms the booking
+                    confirmation = loc.confirmation.first
+                    try:
+                        await confirmation.wait_for(timeout=10000)
+                    except PlaywrightTimeoutError:
+                        return AppointmentBookingResult(
+                            session_id=request.session_id,
+                            success=False,
+                            slot=request.slot,
+                            message="No booking confirmation shown after confirming the slot",
+                        )
+                    text = await confirmation.inner_text()
+                    return AppointmentBookingResult(
+                        session_id=request.session_id,
+                        success=True,
+                        slot=request.slot,
+                        confirmation_number=_extract_reference(text),
+                    )
+                except Exception as exc:
                     return AppointmentBookingResult(
                         session_id=request.session_id,
                         success=False,
                         slot=request.slot,
-                        message="No slots visible at booking time",
+                        message=str(exc),
                     )
-                await self._click(page, buttons[0])
-                await self._click(page, VfsSelectors.confirm)
-                await asyncio.sleep(1)
-                return AppointmentBookingResult(
-                    session_id=request.session_id,
-                    success=True,
-                    slot=request.slot,
-                    confirmation_number=None,
-                )
-            except Exception as exc:
-                return AppointmentBookingResult(
-                    session_id=request.session_id,
-                    success=False,
-                    slot=request.slot,
-                    message=str(exc),
-                )
+            finally:
+                if prefetch is not None:
+                    prefetch.cancel()
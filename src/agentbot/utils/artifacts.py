@@ -2,28 +2,99 @@
 
 from __future__ import annotations
 
-import datetime as dt
+import asyncio
+import functools
 import os
+import time
 from pathlib import Path
+from typing import Dict, Optional, Set
+
+from agentbot.utils.env import get_bool_env
+
+# Screenshots are PNG-encoded in the browser and streamed base64 over CDP, so
+# they are opt-in (AGENTBOT_DEBUG_SCREENSHOTS=true) and saved as small JPEGs.
+SCREENSHOT_QUALITY = 40
+_TS_FORMAT = "%Y%m%d-%H%M%S"
+# session id -> label -> calls so far, for labels captured every Nth call
+_shot_counts: Dict[str, Dict[str, int]] = {}
+
+MAX_BACKGROUND_SCREENSHOTS = 4
+_background_slots = asyncio.Semaphore(MAX_BACKGROUND_SCREENSHOTS)
+_background: Set["asyncio.Task[None]"] = set()
+
+
+# The root is resolved once per process. Directories are still created on
+# every call, so one removed while running (e.g. by a cleanup job) comes back.
+@functools.lru_cache(maxsize=None)
+def _artifacts_root() -> Path:
+    return Path(os.getenv("AGENTBOT_ARTIFACTS", "artifacts")).resolve()
 
 
 def artifacts_dir() -> Path:
-    root = os.getenv("AGENTBOT_ARTIFACTS", "artifacts")
-    path = Path(root).resolve()
+    path = _artifacts_root()
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
 def session_dir(session_id: str) -> Path:
-    path = artifacts_dir() / session_id
+    path = _artifacts_root() / session_id
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-async def save_screenshot(page, session_id: str, label: str) -> Path:
-    ts = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
-    path = session_dir(session_id) / f"{ts}-{label}.png"
-    await page.screenshot(path=str(path))
+def _screenshot_path(session_id: str, label: str, every: int, force: bool) -> Optional[Path]:
+    if not force and not get_bool_env("AGENTBOT_DEBUG_SCREENSHOTS", default=False):
+        return None
+    if every > 1:
+        counts = _shot_counts.setdefault(session_id, {})
+        count = counts[label] = counts.get(label, 0) + 1
+        if (count - 1) % every:
+            return None
+    return session_dir(session_id) / f"{time.strftime(_TS_FORMAT)}-{label}.jpg"
+
+
+def forget_session(session_id: str) -> None:
+    """Drop the every-Nth call counters of ``session_id``; call when its flow ends."""
+    _shot_counts.pop(session_id, None)
+
+
+async def save_screenshot(
+    page, session_id: str, label: str, *, every: int = 1, force: bool = False
+) -> Optional[Path]:
+    """Save a viewport screenshot when debug screenshots are enabled.
+
+    With ``every=N`` only every Nth call per (session, label) is captured, for
+    labels on hot paths; ``force`` captures regardless, for error paths.
+    Returns the file path, or None when skipped.
+    """
+    path = _screenshot_path(session_id, label, every, force)
+    if path is None:
+        return None
+    await page.screenshot(path=str(path), type="jpeg", quality=SCREENSHOT_QUALITY, full_page=False)
     return path
 
 
+def schedule_screenshot(
+    page, session_id: str, label: str, *, every: int = 1
+) -> Optional["asyncio.Task[None]"]:
+    """Like save_screenshot, but captured in the background so the flow goes on.
+
+    At most MAX_BACKGROUND_SCREENSHOTS run at once. Returns the task, or None
+    when skipped.
+    """
+    path = _screenshot_path(session_id, label, every, False)
+    if path is None:
+        return None
+    task = asyncio.create_task(_save_in_background(page, path))
+    # Keep a reference until done; the event loop only holds weak ones
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+async def _save_in_background(page, path: Path) -> None:
+    async with _background_slots:
+        try:
+            await page.screenshot(path=str(path), type="jpeg", quality=SCREENSHOT_QUALITY, full_page=False)
+        except Exception:
+            pass  # the page was closed meanwhile; a debug capture is not worth failing over
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import shlex
-from typing import Sequence
+from typing import Sequence, Tuple
 
 
 _FALSE_VALUES = {"0", "false", "no", "off"}
 
 
+# The environment is read once per name; call clear_env_cache() after changing it.
+@functools.lru_cache(maxsize=None)
 def get_bool_env(name: str, *, default: bool = False) -> bool:
     """Return True/False for an environment flag."""
     raw = os.getenv(name)
@@ -27,14 +30,25 @@ def get_list_env(name: str, *, default: Sequence[str] | None = None) -> list[str
 
     Values can be quoted, e.g. `--foo "--bar=baz qux"`.
     """
+    return list(_list_env(name, tuple(default or ())))
+
+
+@functools.lru_cache(maxsize=None)
+def _list_env(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
     raw = os.getenv(name)
     if raw is None:
-        return list(default or [])
+        return default
     value = raw.strip()
     if not value:
-        return list(default or [])
+        return default
     try:
         parsed = shlex.split(value)
     except ValueError:
         parsed = value.split()
-    return [item for item in parsed if item]
+    return tuple(item for item in parsed if item)
+
+
+def clear_env_cache() -> None:
+    """Forget cached values, e.g. after a test changes the environment."""
+    get_bool_env.cache_clear()
+    _list_env.cache_clear()
@@ -3,21 +3,43 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
-from typing import Optional
+from typing import Dict, Optional
 
-from rich.logging import RichHandler
+from agentbot.utils.env import get_bool_env
+
+# Shared by every handler; formatters hold no per-logger state.
+_FORMATTER = logging.Formatter(
+    "%(asctime)s %(name)s %(levelname)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+# Loggers already configured here, so repeat calls (one per agent or provider
+# instance) skip logging's module lock.
+_loggers: Dict[str, logging.Logger] = {}
+
+
+def _plain_output() -> bool:
+    """Production runs skip Rich's per-record markup and console rendering."""
+    return os.getenv("AGENTBOT_ENV") == "prod" or get_bool_env("AGENTBOT_PLAIN_LOG")
 
 
 def get_logger(name: str, level: int = logging.INFO, *, rich: bool = True) -> logging.Logger:
     """Configure and return a logger."""
-    logger = logging.getLogger(name)
+    cached = _loggers.get(name)
+    if cached is not None:
+        return cached
+    logger = _loggers[name] = logging.getLogger(name)
     if logger.handlers:
         return logger
 
     logger.setLevel(level)
 
-    if rich:
+    if rich and not _plain_output():
+        # Imported here: rich pulls in pygments, which plain runs never need
+        from rich.logging import RichHandler
+
         handler: logging.Handler = RichHandler(
             level=level,
             markup=True,
@@ -30,11 +52,7 @@ def get_logger(name: str, level: int = logging.INFO, *, rich: bool = True) -> lo
         handler = logging.StreamHandler(sys.stdout)
         handler.setLevel(level)
 
-    formatter = logging.Formatter(
-        "%(asctime)s %(name)s %(levelname)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(_FORMATTER)
 
     logger.addHandler(handler)
     logger.propagate = False
@@ -0,0 +1,41 @@
+"""Leaky-bucket rate limiting for calls to rate-limited upstream services."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Let at most ``max_rate`` acquisitions through per ``time_period`` seconds.
+
+    Used as ``async with limiter: ...``; callers over the rate wait their turn
+    instead of tripping the provider's limit and retrying.
+    """
+
+    __slots__ = ("max_rate", "time_period", "_level", "_last", "_lock")
+
+    def __init__(self, max_rate: float, time_period: float = 1.0) -> None:
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._level = 0.0
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        rate = self.max_rate / self.time_period
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._level = max(0.0, self._level - (now - self._last) * rate)
+                self._last = now
+                if self._level + 1 <= self.max_rate:
+                    self._level += 1
+                    return
+                await asyncio.sleep((self._level + 1 - self.max_rate) / rate)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import shutil
+
+from agentbot.utils import artifacts
+from agentbot.utils.artifacts import forget_session, session_dir
+
+
+def test_session_dir_is_recreated_after_removal(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "_artifacts_root", lambda: tmp_path / "artifacts")
+    path = session_dir("s1")
+    assert path.is_dir()
+    shutil.rmtree(tmp_path / "artifacts")
+    assert session_dir("s1").is_dir()
+
+
+def test_every_nth_counters_are_dropped_with_the_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENTBOT_DEBUG_SCREENSHOTS", "true")
+    monkeypatch.setattr(artifacts, "_artifacts_root", lambda: tmp_path)
+    taken = [artifacts._screenshot_path("s1", "slots-visible", 3, False) is not None for _ in range(4)]
+    assert taken == [True, False, False, True]
+    artifacts._screenshot_path("s2", "slots-visible", 3, False)
+
+    forget_session("s1")
+    assert "s1" not in artifacts._shot_counts
+    assert "s2" in artifacts._shot_counts
+    forget_session("s1")  # repeated calls are harmless
+    artifacts._shot_counts.clear()
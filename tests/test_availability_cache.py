@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import pytest
+
+from agentbot.core.availability_cache_redis import RedisAvailabilityCache
+from agentbot.core.models import AppointmentAvailability
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops = []
+
+    def hset(self, key, mapping):
+        self.ops.append((key, mapping))
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        for key, mapping in self.ops:
+            self.redis.data[key] = {
+                name.encode(): value if isinstance(value, bytes) else str(value).encode()
+                for name, value in mapping.items()
+            }
+
+
+class FakeRedis:
+    """The handful of commands the cache uses, without expiry."""
+
+    def __init__(self) -> None:
+        self.data = {}
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def hgetall(self, key):
+        return self.data.get(key, {})
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def cache():
+    cache = RedisAvailabilityCache(probe_ttl=5)
+    cache._redis = FakeRedis()
+    cache.PROBE_POLL_INTERVAL = 0.01
+    return cache
+
+
+def _slot(session_id: str) -> AppointmentAvailability:
+    return AppointmentAvailability(
+        session_id=session_id,
+        slot_id="slot-1",
+        slot_time=dt.datetime(2026, 11, 2, 9, 30, tzinfo=dt.timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_probe_claim_is_exclusive_until_released(cache):
+    key = cache.key("Istanbul", "Tourism", None)
+    token = await cache.claim_probe(key)
+    assert token is not None
+    assert await cache.claim_probe(key) is None
+    await cache.release_probe(key, "someone-else")
+    assert await cache.claim_probe(key) is None
+    await cache.release_probe(key, token)
+    assert await cache.claim_probe(key) is not None
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_the_probing_session_result(cache):
+    key = cache.key("Istanbul", "Tourism", None)
+    token = await cache.claim_probe(key)
+    waiter = asyncio.create_task(cache.wait_for_probe(key, "s2"))
+    await asyncio.sleep(0.03)
+    assert not waiter.done()
+    await cache.set(key, [_slot("s1")])
+    await cache.release_probe(key, token)
+    slots = await asyncio.wait_for(waiter, 1)
+    assert [(slot.session_id, slot.slot_id) for slot in slots] == [("s2", "slot-1")]
+
+
+@pytest.mark.asyncio
+async def test_waiters_stop_when_the_probe_ends_without_a_result(cache):
+    key = cache.key("Istanbul", "Tourism", None)
+    token = await cache.claim_probe(key)
+    waiter = asyncio.create_task(cache.wait_for_probe(key, "s2"))
+    await asyncio.sleep(0.03)
+    await cache.release_probe(key, token)
+    assert await asyncio.wait_for(waiter, 1) is None
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from agentbot.services.email import EmailInboxService
+
+
+class FakeImap:
+    """An inbox of (body, seen) messages numbered from 1."""
+
+    def __init__(self, *bodies: bytes) -> None:
+        self.messages = [[body, False] for body in bodies]
+
+    def noop(self):
+        return "OK", [b""]
+
+    def select(self, folder):
+        return "OK", [str(len(self.messages)).encode()]
+
+    def search(self, charset, *criteria):
+        ids = [str(n).encode() for n, (_, seen) in enumerate(self.messages, 1) if not seen]
+        return "OK", [b" ".join(ids)]
+
+    def fetch(self, id_set, query):
+        data = []
+        for msg_id in id_set.split(","):
+            body, _ = self.messages[int(msg_id) - 1]
+            data.append((f"{msg_id} (BODY[TEXT] {{{len(body)}}}".encode(), body))
+            data.append(b")")
+        return "OK", data
+
+    def store(self, msg_id, command, flags):
+        self.messages[int(msg_id) - 1][1] = True
+        return "OK", [b""]
+
+
+def _service(imap: FakeImap) -> EmailInboxService:
+    service = EmailInboxService("imap.example.test", username="u", password="p")
+    service._cached_client = imap
+    return service
+
+
+@pytest.mark.asyncio
+async def test_codes_from_before_the_mark_are_ignored():
+    imap = FakeImap(b"Your code is 111111")
+    service = _service(imap)
+    mark = await service.mailbox_mark()
+    assert await service.fetch_latest_code(timeout=0, after=mark) is None
+    assert imap.messages[0][1] is False  # the stale mail is left unread
+
+    imap.messages.append([b"Your code is 222222", False])
+    assert await service.fetch_latest_code(timeout=0, after=mark) == "222222"
+
+
+@pytest.mark.asyncio
+async def test_without_a_mark_any_unseen_code_counts():
+    service = _service(FakeImap(b"Your code is 111111"))
+    assert await service.fetch_latest_code(timeout=0) == "111111"
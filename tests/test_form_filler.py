@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentbot.services.form_filler import FieldMapping, FormFiller, fill_all
+
+
+class FakePage:
+    def __init__(self, *, unresolved=(), broken=(), evaluate_error=None) -> None:
+        self.unresolved = set(unresolved)  # selectors the in-page query can't handle
+        self.broken = set(broken)  # selectors page.fill fails on
+        self.evaluate_error = evaluate_error
+        self.values = {}
+        self.evaluate_calls = 0
+        self.filling = 0
+
+    async def evaluate(self, script, pairs):
+        self.evaluate_calls += 1
+        if self.evaluate_error is not None:
+            raise self.evaluate_error
+        missed = []
+        for selector, value in pairs:
+            if selector in self.unresolved:
+                missed.append(selector)
+            else:
+                self.values[selector] = value
+        return missed
+
+    async def fill(self, selector, value):
+        self.filling += 1
+        try:
+            assert self.filling == 1, "page.fill calls overlapped"
+            await asyncio.sleep(0)
+            if selector in self.broken:
+                raise RuntimeError(f"cannot fill {selector}")
+            self.values[selector] = value
+        finally:
+            self.filling -= 1
+
+
+@pytest.mark.asyncio
+async def test_fill_all_sets_css_fields_in_one_evaluate():
+    page = FakePage(unresolved={"xpath=//input[@id='otp']"})
+    pairs = [("#email", "a@b.c"), ("#password", "pw"), ("xpath=//input[@id='otp']", "123")]
+    assert await fill_all(page, pairs) == []
+    assert page.evaluate_calls == 1
+    assert page.values == dict(pairs)
+
+
+@pytest.mark.asyncio
+async def test_fill_all_reports_a_failing_field_and_fills_the_rest():
+    page = FakePage(unresolved={"text=Email", "text=Name"}, broken={"text=Email"})
+    failures = await fill_all(page, [("text=Email", "a@b.c"), ("text=Name", "Ada"), ("#pw", "pw")])
+    assert [selector for selector, _ in failures] == ["text=Email"]
+    assert page.values == {"text=Name": "Ada", "#pw": "pw"}
+
+
+@pytest.mark.asyncio
+async def test_fill_all_falls_back_to_page_fill_when_evaluate_fails():
+    page = FakePage(evaluate_error=RuntimeError("execution context was destroyed"))
+    assert await fill_all(page, [("#email", "a@b.c"), ("#pw", "pw")]) == []
+    assert page.values == {"#email": "a@b.c", "#pw": "pw"}
+
+
+@pytest.mark.asyncio
+async def test_populate_batches_plain_fields_and_tries_fallbacks_in_turn():
+    filler = FormFiller(
+        [
+            FieldMapping(selector="#email", value_key="email"),
+            FieldMapping(selector="text=Name", value_key="name"),
+            FieldMapping(selector="#phone-old || #phone", value_key="phone"),
+            FieldMapping(selector="#city", value_key="city", depends_on="country"),
+        ]
+    )
+    page = FakePage(unresolved={"text=Name"}, broken={"#phone-old"})
+    await filler.populate(page, {"email": "a@b.c", "name": "Ada", "phone": 5551234, "city": "Paris"})
+    assert page.evaluate_calls == 1
+    assert page.values == {"#email": "a@b.c", "text=Name": "Ada", "#phone": "5551234", "#city": "Paris"}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from agentbot.services.http_client import with_backoff
+
+
+def _sender(*outcomes):
+    """Return a send() that yields each outcome in turn (raising exceptions)."""
+    calls = []
+    request = httpx.Request("POST", "https://example.test/submit")
+
+    async def send() -> httpx.Response:
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, request=request)
+
+    return send, calls
+
+
+@pytest.mark.asyncio
+async def test_backoff_retries_statuses_and_transport_errors():
+    request = httpx.Request("GET", "https://example.test/")
+    send, calls = _sender(503, httpx.ReadTimeout("slow", request=request), 200)
+    response = await with_backoff(send, initial=0)
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_resend_non_idempotent_after_read_error():
+    request = httpx.Request("POST", "https://example.test/submit")
+    send, calls = _sender(httpx.ReadTimeout("slow", request=request), 200)
+    with pytest.raises(httpx.ReadTimeout):
+        await with_backoff(send, initial=0, retry_transport_errors=False)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_backoff_retries_connect_errors_for_non_idempotent():
+    request = httpx.Request("POST", "https://example.test/submit")
+    send, calls = _sender(httpx.ConnectError("refused", request=request), 200)
+    response = await with_backoff(send, initial=0, retry_transport_errors=False)
+    assert response.status_code == 200
+    assert len(calls) == 2
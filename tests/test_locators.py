@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import gc
+import weakref
+
+from agentbot.browser import locators
+from agentbot.browser.locators import cached_locator, forget_page
+
+
+class FakeLocator:
+    def __init__(self, page, selector: str) -> None:
+        self.page = page  # like Playwright's, a locator keeps its page alive
+        self.selector = selector
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+        self._close_handlers = []
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self, selector)
+
+    def once(self, event: str, handler) -> None:
+        assert event == "close"
+        self._close_handlers.append(handler)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+        handlers, self._close_handlers = self._close_handlers, []
+        for handler in handlers:
+            handler(self)
+
+
+def test_locators_are_reused_while_the_page_is_open():
+    page = FakePage()
+    first = cached_locator(page, "button.slot")
+    assert cached_locator(page, "button.slot") is first
+    assert cached_locator(page, ".mat-calendar") is not first
+    page.close()
+
+
+def test_closing_a_page_releases_it_and_its_locators():
+    page = FakePage()
+    cached_locator(page, "button.slot")
+    ref = weakref.ref(page)
+    page.close()
+    del page
+    gc.collect()
+    assert ref() is None
+    assert not locators._page_locators
+
+
+def test_forget_page_drops_the_entry_and_closed_pages_are_not_cached():
+    page = FakePage()
+    cached_locator(page, "button.slot")
+    forget_page(page)
+    assert page not in locators._page_locators
+    forget_page(page)  # repeated calls are harmless
+
+    closed = FakePage()
+    closed.closed = True
+    cached_locator(closed, "button.slot")
+    assert closed not in locators._page_locators
+    page.close()
+
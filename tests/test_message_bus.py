@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentbot.core.message_bus import MessageBus
+from agentbot.core.models import EventEnvelope, EventType
+
+AVAILABLE = EventType.APPOINTMENT_AVAILABLE
+
+
+def _event(session_id: str, n: int = 0) -> EventEnvelope:
+    return EventEnvelope(type=AVAILABLE, session_id=session_id, payload={"n": n})
+
+
+async def _subscribe(bus: MessageBus, **kwargs):
+    """Start a subscription and let it register; returns (generator, first-event future)."""
+    events = bus.subscribe(AVAILABLE, **kwargs)
+    first = asyncio.ensure_future(events.__anext__())
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return events, first
+
+
+@pytest.mark.asyncio
+async def test_session_filter_delivers_only_matching_events():
+    bus = MessageBus()
+    mine, mine_first = await _subscribe(bus, session_id="s1")
+    every, every_first = await _subscribe(bus)
+
+    await bus.publish(_event("s2"))
+    await bus.publish(_event("s1"))
+    assert (await asyncio.wait_for(mine_first, 1)).session_id == "s1"
+    assert (await asyncio.wait_for(every_first, 1)).session_id == "s2"
+    assert (await asyncio.wait_for(every.__anext__(), 1)).session_id == "s1"
+    await mine.aclose()
+    await every.aclose()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_the_oldest_event():
+    bus = MessageBus()
+    events, first = await _subscribe(bus, max_queue=2)
+    for n in range(3):
+        await bus.publish(_event("s1", n))
+    assert (await asyncio.wait_for(first, 1)).payload["n"] == 1
+    assert (await asyncio.wait_for(events.__anext__(), 1)).payload["n"] == 2
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unsubscribing_between_publishes_leaves_the_others_subscribed():
+    bus = MessageBus()
+    leaving, leaving_first = await _subscribe(bus)
+    staying, staying_first = await _subscribe(bus)
+
+    await bus.publish(_event("s1", 1))
+    assert (await asyncio.wait_for(leaving_first, 1)).payload["n"] == 1
+    # A snapshot taken before the unsubscribe must stay usable
+    snapshot = bus._snapshot
+    await leaving.aclose()
+    assert len(snapshot[AVAILABLE][None]) == 2
+    assert len(bus._snapshot[AVAILABLE][None]) == 1
+
+    await bus.publish(_event("s1", 2))
+    assert (await asyncio.wait_for(staying_first, 1)).payload["n"] == 1
+    assert (await asyncio.wait_for(staying.__anext__(), 1)).payload["n"] == 2
+    await staying.aclose()
+    assert not bus._snapshot
+    assert not bus._sub_index
+
+
+@pytest.mark.asyncio
+async def test_close_sends_a_sentinel_and_rejects_further_use():
+    bus = MessageBus()
+    events, first = await _subscribe(bus, session_id="s1")
+    await bus.close()
+    sentinel = await asyncio.wait_for(first, 1)
+    assert sentinel.payload["__bus_closed__"] is True
+    with pytest.raises(RuntimeError):
+        await bus.publish(_event("s1"))
+    with pytest.raises(RuntimeError):
+        await bus.subscribe(AVAILABLE).__anext__()
+    await events.aclose()
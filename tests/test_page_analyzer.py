@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from agentbot.services.page_analyzer import PageAnalyzer, _FormExtractor
+
+
+def _extract(html: str) -> _FormExtractor:
+    extractor = _FormExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor
+
+
+def test_nested_forms_are_each_collected_inner_first():
+    extractor = _extract('<form id="outer"><input id="a"><form id="inner"><input id="b"></form></form>')
+    assert extractor.forms == [
+        '<form id="inner"><input id="b"></form>',
+        '<form id="outer"><input id="a"><form id="inner"><input id="b"></form></form>',
+    ]
+
+
+def test_unclosed_label_and_button_do_not_break_the_form():
+    extractor = _extract('<form><label>Email<input id="email"><button>Next</form><p>after</p>')
+    assert extractor.forms == ['<form><label>Email<input id="email"><button>Next</form>']
+    assert extractor.elements["input"] == ['<input id="email">']
+    # Never closed, so never emitted as elements of their own
+    assert extractor.elements["label"] == []
+    assert extractor.elements["button"] == []
+
+
+def test_void_inputs_with_and_without_self_closing_slash():
+    extractor = _extract('<div><input id="a" type="text"><input id="b" type="password"/></div>')
+    assert extractor.elements["input"] == ['<input id="a" type="text">', '<input id="b" type="password"/>']
+    assert extractor.forms == []
+
+
+def test_without_a_form_the_elements_are_used():
+    analyzer = PageAnalyzer(llm=None)
+    html = '<div><label for="e">Email</label><input id="e"><button>Next</button></div>'
+    assert analyzer._extract_form_html(html) == (
+        '<input id="e">\n<button>Next</button>\n<label for="e">Email</label>'
+    )
+
+
+def test_entities_are_decoded_in_text_but_kept_in_tags():
+    extractor = _extract('<form><label>Terms &amp; conditions</label><input value="a&amp;b"></form>')
+    assert extractor.elements["label"] == ["<label>Terms & conditions</label>"]
+    assert extractor.elements["input"] == ['<input value="a&amp;b">']
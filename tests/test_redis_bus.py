@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+from agentbot.core.message_bus_redis import RedisMessageBus
+from agentbot.core.models import EventEnvelope, EventType
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands = []
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.commands.append((stream, fields))
+
+    async def execute(self, raise_on_error=True):
+        if self.redis.failing_writes:
+            self.redis.failing_writes -= 1
+            raise ConnectionError("connection reset")
+        self.redis.written.extend(self.commands)
+        return [b"1-0"] * len(self.commands)
+
+
+class FakeRedis:
+    """Serves queued XREADGROUP batches and records XACKs."""
+
+    def __init__(self, batches=(), *, failing_writes: int = 0) -> None:
+        self.batches = list(batches)
+        self.acked = []
+        self.failing_writes = failing_writes
+        self.written = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def xgroup_create(self, *args, **kwargs):
+        return True
+
+    async def xreadgroup(self, group, consumer, streams, count, block):
+        if self.batches:
+            stream = next(iter(streams))
+            return [(stream, self.batches.pop(0))]
+        await asyncio.sleep(0.01)
+        return []
+
+    async def xack(self, stream, group, *ids):
+        self.acked.extend(ids)
+
+    async def aclose(self):
+        pass
+
+
+def _entry(entry_id: bytes, session_id: str):
+    envelope = EventEnvelope(type=EventType.APPOINTMENT_AVAILABLE, session_id=session_id, payload={})
+    return entry_id, {b"event": envelope.wire()}
+
+
+@pytest.mark.asyncio
+async def test_reader_skips_a_poison_entry_and_acks_the_batch():
+    redis = FakeRedis([[(b"1-0", {b"event": b"\xc1"}), (b"2-0", {b"event": msgpack.packb({})}), _entry(b"3-0", "s1")]])
+    bus = RedisMessageBus("redis://localhost:6379/0")
+    bus._redis = redis
+
+    events = bus.subscribe(EventType.APPOINTMENT_AVAILABLE)
+    envelope = await asyncio.wait_for(events.__anext__(), 1)
+    assert (envelope.session_id, envelope.id) == ("s1", "3-0")
+    assert redis.acked == [b"1-0", b"2-0", b"3-0"]
+    assert not bus._readers[EventType.APPOINTMENT_AVAILABLE].done()
+    await events.aclose()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_publish_rejects_a_payload_msgpack_cannot_encode():
+    bus = RedisMessageBus("redis://localhost:6379/0")
+    bus._redis = FakeRedis()
+    bad = EventEnvelope(type=EventType.APPOINTMENT_AVAILABLE, session_id="s1", payload={"at": object()})
+    with pytest.raises(TypeError):
+        await bus.publish(bad)
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_is_retried_after_a_transport_error():
+    redis = FakeRedis(failing_writes=2)
+    bus = RedisMessageBus("redis://localhost:6379/0")
+    bus._redis = redis
+    bus.RETRY_INITIAL = 0.001
+    for session_id in ("s1", "s2"):
+        await bus.publish(EventEnvelope(type=EventType.APPOINTMENT_AVAILABLE, session_id=session_id, payload={}))
+    await asyncio.wait_for(bus._queue.join(), 1)
+    assert len(redis.written) == 2
+    await bus.close()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from agentbot.core.runtime import AgentBundle, AgentRuntime
+
+
+class FakeAgent:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.running = False
+
+    async def start(self) -> None:
+        if self.error is not None:
+            raise self.error
+        self.running = True
+
+    async def stop(self) -> None:
+        self.running = False
+
+
+@pytest.mark.asyncio
+async def test_start_raises_and_stops_the_others_when_an_agent_fails():
+    runtime = AgentRuntime(session_store=None)
+    healthy, broken = FakeAgent(), FakeAgent(RuntimeError("no browser"))
+    runtime._bundles.append(AgentBundle(session_id="s1", monitor_agent=healthy, booking_agent=broken))
+
+    with pytest.raises(RuntimeError, match="no browser"):
+        await runtime.start()
+    assert not healthy.running
+    assert not runtime._started
+
+
+@pytest.mark.asyncio
+async def test_start_marks_the_runtime_started_when_every_agent_starts():
+    runtime = AgentRuntime(session_store=None)
+    monitor, booking = FakeAgent(), FakeAgent()
+    runtime._bundles.append(AgentBundle(session_id="s1", monitor_agent=monitor, booking_agent=booking))
+
+    await runtime.start()
+    assert monitor.running and booking.running
+    assert runtime._started
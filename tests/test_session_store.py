@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+
+import orjson
+import pytest
+
+from agentbot.data.session_store import SessionRecord, SessionStore
+
+
+def _record(session_id: str, email: str = "a@example.com") -> SessionRecord:
+    return SessionRecord(session_id=session_id, user_id="u1", email=email)
+
+
+def _count_dumps(store: SessionStore) -> list:
+    writes = []
+    dump = store._dump
+
+    def _counting(serialized):
+        writes.append([item["session_id"] for item in serialized])
+        dump(serialized)
+
+    store._dump = _counting
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_rapid_upserts_share_one_write(tmp_path):
+    store = SessionStore(tmp_path / "sessions.json")
+    writes = _count_dumps(store)
+    await asyncio.gather(*(store.upsert(_record(f"s{n}")) for n in range(5)))
+    assert writes == [["s0", "s1", "s2", "s3", "s4"]]
+
+
+@pytest.mark.asyncio
+async def test_state_is_on_disk_once_upsert_returns(tmp_path):
+    path = tmp_path / "sessions.json"
+    store = SessionStore(path)
+    await store.upsert(_record("s1"))
+    await store.upsert(_record("s1", email="b@example.com"))
+    await store.delete("missing")
+    assert [item["email"] for item in orjson.loads(path.read_bytes())] == ["b@example.com"]
+    reopened = SessionStore(path)
+    assert (await reopened.get("s1")).email == "b@example.com"
+
+
+@pytest.mark.asyncio
+async def test_a_cancelled_caller_does_not_abort_the_write(tmp_path):
+    path = tmp_path / "sessions.json"
+    store = SessionStore(path)
+    writer = asyncio.ensure_future(store.upsert(_record("s1")))
+    await asyncio.sleep(0)
+    writer.cancel()
+    for _ in range(100):
+        if path.exists():
+            break
+        await asyncio.sleep(0.01)
+    assert [item["session_id"] for item in orjson.loads(path.read_bytes())] == ["s1"]
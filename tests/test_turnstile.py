@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentbot.site import turnstile
+from agentbot.site.turnstile import await_turnstile_if_present
+
+
+class FakePage:
+    """Answers query_selector from a set of present selectors; no wait_for_function."""
+
+    def __init__(self, present=(), *, iframe_after=None, text="") -> None:
+        self.present = set(present)
+        self.iframe_after = iframe_after  # seconds until the iframe attaches
+        self.text = text
+        self.waited_for_iframe = False
+
+    async def query_selector(self, selector):
+        if selector == turnstile._TURNSTILE_WIDGET:
+            return object() if self.present else None
+        if selector == turnstile._TURNSTILE_IFRAME:
+            return object() if "iframe" in self.present else None
+        return None
+
+    async def wait_for_selector(self, selector, state, timeout):
+        assert (selector, state) == (turnstile._TURNSTILE_IFRAME, "attached")
+        if self.iframe_after is None or self.iframe_after * 1000 > timeout:
+            raise TimeoutError(selector)
+        await asyncio.sleep(self.iframe_after)
+        self.present.add("iframe")
+        self.waited_for_iframe = True
+
+    async def evaluate(self, script):
+        return "just a moment" in self.text.lower()
+
+
+@pytest.fixture(autouse=True)
+def _short_waits(monkeypatch):
+    monkeypatch.setattr(turnstile, "CHALLENGE_SETTLE", 0.05)
+    slept = []
+
+    async def _record(page, wait_time):
+        slept.append(wait_time)
+
+    monkeypatch.setattr(turnstile, "_wait_for_widget", _record)
+    return slept
+
+
+@pytest.mark.asyncio
+async def test_container_without_iframe_waits_for_the_iframe_then_the_widget(_short_waits):
+    page = FakePage({"div.cf-turnstile"}, iframe_after=0.01)
+    await await_turnstile_if_present(page, timeout=15000)
+    assert page.waited_for_iframe
+    assert _short_waits == [15000]
+
+
+@pytest.mark.asyncio
+async def test_container_whose_iframe_never_loads_is_not_waited_on(_short_waits):
+    page = FakePage({"div.cf-turnstile"})
+    await await_turnstile_if_present(page, timeout=15000)
+    assert _short_waits == []
+
+
+@pytest.mark.asyncio
+async def test_iframe_less_challenge_page_gets_a_settle_delay(_short_waits):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await await_turnstile_if_present(FakePage(text="Just a moment..."), timeout=15000)
+    assert loop.time() - started >= 0.05
+    assert _short_waits == []
+
+
+@pytest.mark.asyncio
+async def test_clean_page_returns_at_once(_short_waits):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await await_turnstile_if_present(FakePage(text="Book an appointment"), timeout=15000)
+    assert loop.time() - started < 0.05
+    assert _short_waits == []